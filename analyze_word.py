@@ -0,0 +1,184 @@
+"""Analyze an inflected Finnish noun or verb, i.e., find its lemma(s),
+declension(s)/conjugation(s) and case/number or mood/tense/etc."""
+
+import os, sys
+from lexicon import Lexicon, LEXICON_FILE, get_source_hash
+from decline_noun import decline_noun_paradigm_specific, \
+get_cons_grad as get_noun_cons_grad, ITEM_NAMES as NOUN_ITEM_NAMES
+from conjugate_verb import conjugate_verb_paradigm_specific, \
+get_cons_grads as get_verb_cons_grads, ITEM_NAMES as VERB_ITEM_NAMES
+
+NOUN_FILE = "generated-lists/nouns.csv"
+VERB_FILE = "generated-lists/verbs.csv"
+
+# form name for the lemma of a verb (1st infinitive)
+VERB_LEMMA_FORM = "inf"
+
+def status_msg(msg):
+    # print a status message to stderr (won't be redirected to output file)
+    print(msg, file=sys.stderr)
+
+def read_csv(filename):
+    # generate lines from a CSV file as tuples of fields
+    with open(filename, "rt", encoding="utf8") as handle:
+        handle.seek(0)
+        for line in handle:
+            yield tuple(line.rstrip("\n").split(","))
+
+def read_classes(filename):
+    # generate (lemma, declensions/conjugations) from a CSV file
+    for fields in read_csv(filename):
+        yield (fields[0], tuple(int(c, 10) for c in fields[1:]))
+
+def generate_analyses(nounFile=NOUN_FILE, verbFile=VERB_FILE):
+    """Generate all inflected forms of the nouns and verbs in CSV files (like
+    those created by extract.sh) with their analyses.
+    nounFile: CSV file with nouns and Kotus declensions
+    verbFile: CSV file with verbs and Kotus conjugations
+    generate: (inflected, lemma, declension/conjugation, form name), e.g.
+              ("kuusien", "kuusi", 24, "gen-pl")"""
+
+    yield from generate_table_analyses(
+        read_classes(nounFile), read_classes(verbFile)
+    )
+
+def generate_table_analyses(nouns, verbs):
+    """Like generate_analyses() but for nouns and verbs already in memory.
+    nouns:    (noun, Kotus declensions) pairs, e.g. from a dict's items()
+    verbs:    (verb, Kotus conjugations) pairs
+    generate: see generate_analyses()"""
+
+    for (lemma, decls) in nouns:
+        for decl in decls:
+            consGrad = get_noun_cons_grad(lemma, decl)
+            for (form, inflected) in decline_noun_paradigm_specific(
+                lemma, decl, consGrad
+            ).items():
+                formName = "-".join(NOUN_ITEM_NAMES[i] for i in form)
+                for i in set(inflected):
+                    yield (i, lemma, decl, formName)
+
+    for (lemma, conjs) in verbs:
+        for conj in conjs:
+            yield (lemma, lemma, conj, VERB_LEMMA_FORM)
+            # {form: set of inflected forms, ...} with or without consonant
+            # gradation if it is optional
+            paradigm = {}
+            for consGrad in get_verb_cons_grads(lemma, conj):
+                for (form, inflected) in conjugate_verb_paradigm_specific(
+                    lemma, conj, consGrad
+                ).items():
+                    paradigm.setdefault(form, set()).update(inflected)
+            for (form, inflected) in paradigm.items():
+                formName = "-".join(VERB_ITEM_NAMES[i] for i in form)
+                for i in inflected:
+                    yield (i, lemma, conj, formName)
+
+class Analyzer:
+    """Find the lemmas of inflected Finnish nouns and verbs from an inverse
+    table of all inflected forms of known lemmas. Each lookup hashes the word
+    once, so it takes time proportional to the length of the word."""
+
+    def __init__(self, analyses):
+        """analyses: iterable of (inflected, lemma, declension/conjugation,
+        form name), e.g. from generate_analyses()"""
+
+        self._lemmas = []     # lemmas by lemma number
+        self._formNames = []  # form names by form number
+        lemmaNumbers = {}
+        formNumbers = {}
+
+        # {inflected: analysis or tuple of analyses, ...}; to save memory,
+        # each analysis is packed into an int (lemma number, form number,
+        # declension/conjugation)
+        self._table = {}
+
+        for (inflected, lemma, conj, formName) in analyses:
+            if lemma not in lemmaNumbers:
+                lemmaNumbers[lemma] = len(self._lemmas)
+                self._lemmas.append(lemma)
+            if formName not in formNumbers:
+                formNumbers[formName] = len(self._formNames)
+                self._formNames.append(formName)
+
+            packed = lemmaNumbers[lemma] << 16 | formNumbers[formName] << 8 \
+            | conj
+            old = self._table.get(inflected)
+            if old is None:
+                self._table[inflected] = packed
+            elif isinstance(old, int):
+                if old != packed:
+                    self._table[inflected] = (old, packed)
+            elif packed not in old:
+                self._table[inflected] = old + (packed,)
+
+    def __len__(self):
+        # number of distinct inflected forms
+        return len(self._table)
+
+    def analyze(self, word):
+        """word:   an inflected noun or verb, e.g. "kuusien"
+        return: a sorted tuple of (lemma, declension/conjugation, form name),
+                e.g. (("kuusi", 24, "gen-pl"), ("kuusi", 27, "gen-pl")); empty
+                if the word was not recognized"""
+
+        packed = self._table.get(word, ())
+        if isinstance(packed, int):
+            packed = (packed,)
+        return tuple(sorted(
+            (self._lemmas[p >> 16], p & 0xff, self._formNames[p >> 8 & 0xff])
+            for p in packed
+        ))
+
+def is_lexicon_current():
+    # is there a lexicon file that is newer than the word lists and was
+    # written by the current versions of the modules?
+    try:
+        lexiconTime = os.path.getmtime(LEXICON_FILE)
+        if any(
+            os.path.getmtime(f) > lexiconTime for f in (NOUN_FILE, VERB_FILE)
+        ):
+            return False
+        with Lexicon(LEXICON_FILE) as lexicon:
+            return lexicon.sourceHash == get_source_hash()
+    except (OSError, ValueError):
+        # ValueError: an old version of the file format or a truncated file
+        return False
+
+def get_words():
+    # generate words to analyze from arguments or stdin
+    if sys.argv[1:] == ["-"]:
+        yield from (l.rstrip("\n") for l in sys.stdin)
+    else:
+        yield from sys.argv[1:]
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(
+            "Analyze inflected Finnish nouns and verbs. Arguments: one or "
+            "more words, or '-' to read words from stdin (one per line). "
+            "Print CSV lines: word,lemma,declension/conjugation,form (just "
+            "the word if unrecognized). Needs files created by extract.sh."
+        )
+
+    if is_lexicon_current():
+        analyzer = Lexicon(LEXICON_FILE)
+    else:
+        if os.path.exists(LEXICON_FILE):
+            status_msg(f"{LEXICON_FILE} is out of date.")
+        status_msg(
+            "Generating inflected forms (run lexicon.py to skip this step)..."
+        )
+        analyzer = Analyzer(generate_analyses())
+    status_msg(f"Inflected forms: {len(analyzer)}")
+
+    for word in get_words():
+        analyses = analyzer.analyze(word)
+        if analyses:
+            for (lemma, conj, formName) in analyses:
+                print(f"{word},{lemma},{conj},{formName}")
+        else:
+            print(word)
+
+if __name__ == "__main__":
+    main()
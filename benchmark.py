@@ -0,0 +1,182 @@
+# benchmark decline_noun.py etc. on the word lists created by extract.sh
+
+import sys, time
+import noundecl, verbconj
+from noundecl import get_declensions
+from verbconj import get_conjugations
+from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
+from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
+from decline_noun import decline_noun_specific, \
+decline_noun_paradigm_specific, ALL_FORMS as ALL_NOUN_FORMS
+from conjugate_verb import conjugate_verb_specific, \
+conjugate_verb_paradigm_specific, ALL_FORMS as ALL_VERB_FORMS
+
+REPEAT_COUNT = 3  # run each benchmark this many times and report the best
+
+def read_csv(filename):
+    # generate lines from a CSV file as tuples of fields
+    with open(filename, "rt", encoding="utf8") as handle:
+        handle.seek(0)
+        for line in handle:
+            yield tuple(line.rstrip("\n").split(","))
+
+def get_noun_items():
+    # return a tuple of (lemma, declension, consGrad) for all nouns
+    return tuple(
+        (fields[0], int(d, 10), get_noun_cons_grad(fields[0], int(d, 10)))
+        for fields in read_csv("generated-lists/nouns.csv")
+        for d in fields[1:]
+    )
+
+def get_verb_items():
+    # return a tuple of (lemma, conjugation, consGrad) for all verbs
+    return tuple(
+        (fields[0], int(c, 10), get_verb_cons_grad(fields[0], int(c, 10)))
+        for fields in read_csv("generated-lists/verbs.csv")
+        for c in fields[1:]
+    )
+
+def time_function(function, *args):
+    # run the function REPEAT_COUNT times; return the best time in seconds
+    bestTime = None
+    for i in range(REPEAT_COUNT):
+        startTime = time.perf_counter()
+        function(*args)
+        elapsed = time.perf_counter() - startTime
+        if bestTime is None or elapsed < bestTime:
+            bestTime = elapsed
+    return bestTime
+
+def decline_all(items):
+    # decline each noun in each case and number separately
+    for (lemma, decl, consGrad) in items:
+        for form in ALL_NOUN_FORMS:
+            for inflected in decline_noun_specific(
+                lemma, decl, consGrad, *form
+            ):
+                pass
+
+def decline_all_paradigms(items):
+    # decline each noun in all cases and numbers at once
+    for (lemma, decl, consGrad) in items:
+        decline_noun_paradigm_specific(lemma, decl, consGrad)
+
+def bench_dn():
+    # benchmark decline_noun.py
+    items = get_noun_items()
+    for (description, function) in (
+        ("one case/number at a time", decline_all),
+        ("whole paradigms",           decline_all_paradigms),
+    ):
+        seconds = time_function(function, items)
+        print(
+            f"Declined {len(items)} lemma(s) in {len(ALL_NOUN_FORMS)} "
+            f"case/number combination(s), {description}, in {seconds:.3f} s "
+            f"({len(items) / seconds:.0f} lemmas/s)."
+        )
+
+def conjugate_all(items):
+    # conjugate each verb in each form separately
+    for (lemma, conj, consGrad) in items:
+        for form in ALL_VERB_FORMS:
+            for inflected in conjugate_verb_specific(
+                lemma, conj, consGrad, *form
+            ):
+                pass
+
+def conjugate_all_paradigms(items):
+    # conjugate each verb in all forms at once
+    for (lemma, conj, consGrad) in items:
+        conjugate_verb_paradigm_specific(lemma, conj, consGrad)
+
+def bench_cv():
+    # benchmark conjugate_verb.py
+    items = get_verb_items()
+    for (description, function) in (
+        ("one form at a time", conjugate_all),
+        ("whole paradigms",    conjugate_all_paradigms),
+    ):
+        seconds = time_function(function, items)
+        print(
+            f"Conjugated {len(items)} lemma(s) in {len(ALL_VERB_FORMS)} "
+            f"form(s), {description}, in {seconds:.3f} s "
+            f"({len(items) / seconds:.0f} lemmas/s)."
+        )
+
+def get_words():
+    # return a tuple of all words
+    return tuple(fields[0] for fields in read_csv("generated-lists/words.csv"))
+
+def match_all_one_at_a_time(rules, words):
+    # find the first matching rule for each word by trying each rule in turn
+    for word in words:
+        for (value, regex) in rules:
+            if regex.search(word) is not None:
+                break
+
+def match_all_with_automaton(automaton, words):
+    # find the first matching rule for each word using an automaton
+    for word in words:
+        automaton.match(word)
+
+def classify_all(items):
+    # get the declensions/conjugations and consonant gradation of each word
+    for (word, isNoun) in items:
+        if isNoun:
+            for decl in get_declensions(word):
+                get_noun_cons_grad(word, decl)
+        else:
+            for conj in get_conjugations(word):
+                get_verb_cons_grad(word, conj)
+
+def bench_cl():
+    # benchmark noundecl.py, verbconj.py, noun_consgrad.py and verb_consgrad.py
+    words = get_words()
+
+    # (word, is_noun) for each noun (declension 1-49) and verb (52-76)
+    items = tuple(
+        (fields[0], int(fields[1], 10) <= 49)
+        for fields in read_csv("generated-lists/words.csv")
+        if fields[1:2] != ("",) and len(fields) > 1
+        and (1 <= int(fields[1], 10) <= 49 or 52 <= int(fields[1], 10) <= 76)
+    )
+    seconds = time_function(classify_all, items)
+    print(
+        f"Got the declensions/conjugations and consonant gradation of "
+        f"{len(items)} noun(s)/verb(s) in {seconds:.3f} s "
+        f"({len(items) / seconds:.0f} words/s)."
+    )
+
+    for (module, syllCounts) in ((noundecl, (1, 2, 3, 4)), (verbconj, (2, 3))):
+        for syllCnt in syllCounts:
+            name = f"{module.__name__}._RULES_{syllCnt}SYLL"
+            rules = getattr(module, f"_RULES_{syllCnt}SYLL")
+            automaton = getattr(module, f"_AUTOMATON_{syllCnt}SYLL")
+            seconds1 = time_function(match_all_one_at_a_time, rules, words)
+            seconds2 = time_function(
+                match_all_with_automaton, automaton, words
+            )
+            print(
+                f"{name} ({len(rules)} rules) on {len(words)} word(s): one "
+                f"rule at a time {seconds1:.3f} s, automaton {seconds2:.3f} s "
+                f"({seconds1 / seconds2:.1f}x)."
+            )
+
+def main():
+    benchmarks = {
+        "dn": bench_dn,
+        "cv": bench_cv,
+        "cl": bench_cl,
+    }
+
+    if len(sys.argv) != 2 or sys.argv[1] not in benchmarks:
+        sys.exit(
+            "Argument: which benchmark to run ('dn'=decline_noun.py, "
+            "'cv'=conjugate_verb.py, 'cl'=noundecl.py/verbconj.py/"
+            "noun_consgrad.py/verb_consgrad.py). Needs files created by "
+            "extract.sh."
+        )
+
+    benchmarks[sys.argv[1]]()
+
+main()
@@ -0,0 +1,260 @@
+"""Build the files that extract.sh builds, but only run the steps whose inputs
+(files and programs) have changed since the last build."""
+
+# The SHA-256 hashes of the inputs and outputs of each step are saved in
+# STATE_FILE. A step is run if its arguments or any of its inputs (including
+# the program and the local modules it imports) have changed or if any of its
+# outputs have been changed or deleted since the step was last run. If a step
+# that was run produces the same outputs as before, the steps that read them
+# are not run either.
+
+import ast, hashlib, json, os, subprocess, sys
+
+XML_FILE = "kotus-sanalista_v1.xml"
+STATE_FILE = "generated-lists/build-state.json"
+
+def _g(filename):
+    # a file under generated-lists/
+    return "generated-lists/" + filename
+
+# the steps in the order they are run:
+# (arguments to python3, input files other than the program, output file for
+# stdout or None, other output files, sort stdout?)
+# unlike extract.sh, no file is rewritten by a later step, so each step has
+# its own output files
+STEPS = (
+    (
+        (
+            "xml2csv.py", XML_FILE, _g("words-orig.csv"),
+            _g("words-consgrad-orig.csv")
+        ),
+        (XML_FILE,), None,
+        (_g("words-orig.csv"), _g("words-consgrad-orig.csv")), False
+    ),
+    # add words that only occur as finals of compounds
+    (
+        ("finals.py", _g("words-orig.csv"), "compounds.txt"),
+        (_g("words-orig.csv"), "compounds.txt"),
+        _g("finals.csv"), (), True
+    ),
+    (
+        ("csv-combine.py", _g("words-orig.csv"), _g("finals.csv")),
+        (_g("words-orig.csv"), _g("finals.csv")),
+        _g("words-with-finals.csv"), (), False
+    ),
+    (
+        ("finals.py", _g("words-consgrad-orig.csv"), "compounds.txt"),
+        (_g("words-consgrad-orig.csv"), "compounds.txt"),
+        _g("finals-consgrad.csv"), (), True
+    ),
+    (
+        (
+            "csv-combine.py", _g("words-consgrad-orig.csv"),
+            _g("finals-consgrad.csv")
+        ),
+        (_g("words-consgrad-orig.csv"), _g("finals-consgrad.csv")),
+        _g("words-consgrad-with-finals.csv"), (), False
+    ),
+    # replace (non-compound) plurals with singulars and delete compounds
+    (
+        ("replace-plurals.py", _g("words-with-finals.csv"), "plurals.csv"),
+        (_g("words-with-finals.csv"), "plurals.csv"),
+        _g("words-singular.csv"), (), False
+    ),
+    (
+        ("strip-compounds.py", _g("words-singular.csv"), "compounds.txt"),
+        (_g("words-singular.csv"), "compounds.txt"),
+        _g("words.csv"), (), False
+    ),
+    (
+        (
+            "replace-plurals.py", _g("words-consgrad-with-finals.csv"),
+            "plurals.csv"
+        ),
+        (_g("words-consgrad-with-finals.csv"), "plurals.csv"),
+        _g("words-consgrad-singular.csv"), (), False
+    ),
+    (
+        (
+            "strip-compounds.py", _g("words-consgrad-singular.csv"),
+            "compounds.txt"
+        ),
+        (_g("words-consgrad-singular.csv"), "compounds.txt"),
+        _g("words-consgrad.csv"), (), False
+    ),
+    # separate nouns and verbs, group them by number of syllables
+    (
+        ("filter-by-conjugation.py", _g("words.csv"), "1", "49"),
+        (_g("words.csv"),), _g("nouns.csv"), (), False
+    ),
+    (
+        ("filter-by-conjugation.py", _g("words.csv"), "52", "76"),
+        (_g("words.csv"),), _g("verbs.csv"), (), False
+    ),
+) + tuple(
+    (
+        ("filter-by-syllcnt.py", _g(f"{pos}s.csv"), str(syllCnt)),
+        (_g(f"{pos}s.csv"),), _g(f"{pos}s-{syllCnt}syll.csv"), (), False
+    )
+    for syllCnt in range(1, 5) for pos in ("noun", "verb")
+) + (
+    (
+        ("nonfinals.py", "compounds.txt"), ("compounds.txt",),
+        _g("nonfinals.txt"), (), True
+    ),
+    (
+        ("compositives.py", "compounds.txt", _g("words.csv")),
+        ("compounds.txt", _g("words.csv")),
+        _g("compositives.txt"), (), True
+    ),
+    (
+        ("splitcomp.py", "--build"), (_g("nonfinals.txt"), _g("finals.csv")),
+        None, (_g("splitcomp-words.bin"),), False
+    ),
+    (
+        ("classcache.py",), (_g("words.csv"),),
+        None, (_g("classcache.bin"),), False
+    ),
+    (
+        ("lexicon.py",), (_g("nouns.csv"), _g("verbs.csv")),
+        None, (_g("lexicon.bin"),), False
+    ),
+    (
+        ("stats-nounverb.py", _g("words.csv")), (_g("words.csv"),),
+        "stats-nounverb.txt", (), False
+    ),
+)
+
+def get_hash(filename, hashes):
+    # get the SHA-256 hash of a file as a hex string (None if the file doesn't
+    # exist)
+    # hashes: {filename: hash, ...}; files already hashed during this build
+    if filename not in hashes:
+        hasher = hashlib.sha256()
+        try:
+            with open(filename, "rb") as handle:
+                while block := handle.read(2 ** 20):
+                    hasher.update(block)
+            hashes[filename] = hasher.hexdigest()
+        except FileNotFoundError:
+            hashes[filename] = None
+    return hashes[filename]
+
+def get_local_modules(program, modules=None):
+    # get the program and the local modules it imports, directly or not, as a
+    # set of filenames
+    if modules is None:
+        modules = set()
+    modules.add(program)
+    with open(program, "rb") as handle:
+        tree = ast.parse(handle.read(), program)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        for filename in (n + ".py" for n in names):
+            if filename not in modules and os.path.isfile(filename):
+                get_local_modules(filename, modules)
+    return modules
+
+def read_state():
+    # read the hashes saved by the previous build
+    # return: {first_output_file: {"command": arguments, "inputs": {file:
+    # hash, ...}, "outputs": {file: hash, ...}}, ...}
+    try:
+        with open(STATE_FILE, "rt", encoding="utf8") as handle:
+            handle.seek(0)
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def write_state(state):
+    tempFile = STATE_FILE + ".tmp"
+    with open(tempFile, "wt", encoding="utf8") as handle:
+        json.dump(state, handle, indent=1, sort_keys=True)
+    os.replace(tempFile, STATE_FILE)
+
+def run_step(step, state, hashes, force):
+    # run a step if needed; update state and hashes
+    # return: was the step run?
+
+    (args, inputs, stdoutFile, otherOutputs, sortOutput) = step
+    outputs = ([stdoutFile] if stdoutFile is not None else []) \
+    + list(otherOutputs)
+
+    inputHashes = dict(
+        (f, get_hash(f, hashes))
+        for f in sorted(set(inputs) | get_local_modules(args[0]))
+    )
+    missing = [f for (f, h) in inputHashes.items() if h is None]
+    if missing:
+        sys.exit("Input file(s) not found: " + ", ".join(missing))
+
+    previous = state.get(outputs[0])
+    if not force and previous is not None \
+    and previous["command"] == list(args) \
+    and previous["inputs"] == inputHashes \
+    and all(
+        get_hash(f, hashes) == previous["outputs"].get(f) for f in outputs
+    ):
+        print(f"Up to date: {', '.join(outputs)}", file=sys.stderr)
+        return False
+
+    print(
+        "Running: " + " ".join(args)
+        + ("" if stdoutFile is None else f" > {stdoutFile}"),
+        file=sys.stderr
+    )
+    command = [sys.executable] + list(args)
+    try:
+        if stdoutFile is None:
+            subprocess.run(command, check=True)
+        else:
+            output = subprocess.run(
+                command, stdout=subprocess.PIPE, check=True
+            ).stdout
+            if sortOutput:
+                output = subprocess.run(
+                    ["sort"], input=output, stdout=subprocess.PIPE, check=True
+                ).stdout
+            tempFile = stdoutFile + ".tmp"
+            with open(tempFile, "wb") as handle:
+                handle.write(output)
+            os.replace(tempFile, stdoutFile)
+    except subprocess.CalledProcessError:
+        sys.exit("Step failed: " + " ".join(args))
+
+    for filename in outputs:
+        hashes.pop(filename, None)
+    state[outputs[0]] = {
+        "command": list(args),
+        "inputs": inputHashes,
+        "outputs": dict((f, get_hash(f, hashes)) for f in outputs),
+    }
+    write_state(state)
+    return True
+
+def main():
+    if sys.argv[1:] not in ([], ["--force"]):
+        sys.exit(
+            "Build the files that extract.sh builds; only run the steps whose "
+            f"inputs have changed since the last build (see {STATE_FILE}). "
+            "Optional argument: --force (run all steps). Run in the project "
+            f"directory; needs {XML_FILE}."
+        )
+    force = sys.argv[1:] == ["--force"]
+
+    os.makedirs("generated-lists", exist_ok=True)
+    state = read_state()
+    hashes = {}
+    stepsRun = sum(run_step(s, state, hashes, force) for s in STEPS)
+    print(
+        f"{stepsRun} step(s) run, {len(STEPS) - stepsRun} up to date.",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
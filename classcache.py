@@ -0,0 +1,212 @@
+"""An optional cache of word classifications (syllable counts, declensions,
+conjugations, consonant gradation) shared by countsyll.py, noundecl.py,
+verbconj.py, noun_consgrad.py and verb_consgrad.py. Disabled until enable(),
+load() or warm_up() is called."""
+
+# The classifiers call each other: e.g. decline_noun() gets the declensions
+# (which counts the syllables) and then consonant gradation. With the cache,
+# each classification of a word is computed once; a cache warmed up from
+# WORDS_FILE and saved to CACHE_FILE lets the classifiers answer for all known
+# Kotus words without running a single regex. The cache file is only used if
+# the classifiers' source files haven't changed since it was saved.
+# Lookups don't use a lock; dict operations are atomic in CPython, so threads
+# can share the cache (the statistics may then be slightly off).
+
+# hashlib, marshal and zlib are imported when needed; every classifier imports
+# this module, and hashlib alone would add several milliseconds to the start
+# of every program that uses one
+import collections, os, sys
+
+WORDS_FILE = "generated-lists/words.csv"
+CACHE_FILE = "generated-lists/classcache.bin"
+
+# modules whose results are cached (and the module they depend on, and this
+# module, which defines the keys of the tables)
+_MODULES = (
+    "countsyll", "noundecl", "verbconj", "noun_consgrad", "verb_consgrad",
+    "ruleautomaton", "classcache",
+)
+# names of tables and their keys -> values:
+#   syllables:    word -> count_syllables()
+#   declensions:  noun without "'- " at either end -> get_declensions()
+#   conjugations: verb without "'- " at either end -> get_conjugations()
+#   nounConsGrad: (declension, noun) -> get_consonant_gradation() of
+#                 noun_consgrad.py
+#   verbConsGrad: (conjugation, verb) -> get_consonant_gradation() of
+#                 verb_consgrad.py
+_TABLE_NAMES = (
+    "syllables", "declensions", "conjugations", "nounConsGrad", "verbConsGrad"
+)
+
+_tables = None  # {table_name: {key: value, ...}, ...} when enabled
+_memoize = True
+_stats = collections.Counter()  # hits, misses
+
+def enable(memoize=True):
+    """Enable the cache (if not enabled yet) and reset the statistics.
+    memoize: store the results computed on cache misses? If False, only the
+             results from load() and warm_up() are used, so the cache doesn't
+             grow (e.g. for a server that gets arbitrary words)."""
+
+    global _tables, _memoize
+
+    if _tables is None:
+        _tables = dict((n, {}) for n in _TABLE_NAMES)
+    _memoize = memoize
+    _stats.clear()
+
+def disable():
+    """Disable the cache and free it."""
+
+    global _tables
+
+    _tables = None
+
+def get_stats():
+    """return: {"hits": int, "misses": int, "entries": int}"""
+
+    return {
+        "hits": _stats["hits"],
+        "misses": _stats["misses"],
+        "entries": 0 if _tables is None else sum(
+            len(t) for t in _tables.values()
+        ),
+    }
+
+def get(table, key, function, *args):
+    """Get a classification from the cache or compute it.
+    table:    name of the table (see _TABLE_NAMES)
+    key:      e.g. a word
+    function: computes the classification from args; called directly if the
+              cache is disabled
+    return:   the classification"""
+
+    if _tables is None:
+        return function(*args)
+    try:
+        value = _tables[table][key]
+    except KeyError:
+        _stats["misses"] += 1
+        value = function(*args)
+        if _memoize:
+            _tables[table][key] = value
+        return value
+    _stats["hits"] += 1
+    return value
+
+def read_lines(filename):
+    with open(filename, "rt", encoding="utf8") as handle:
+        handle.seek(0)
+        yield from (l.rstrip("\n") for l in handle)
+
+def _read_words(filename):
+    # generate (word, set of declensions/conjugations) from a CSV file
+    for line in read_lines(filename):
+        fields = line.split(",")
+        yield (fields[0], {int(c, 10) for c in fields[1:]})
+
+def warm_up(filename=WORDS_FILE, words=None):
+    """Enable the cache and classify all words in a CSV file (like
+    generated-lists/words.csv): count the syllables of each word, get the
+    declensions and consonant gradation of nouns (words with declensions
+    1-49) and the conjugations and consonant gradation of verbs (52-76).
+    words:  {word: set of declensions/conjugations, ...} to classify instead
+            of the file (e.g. the table the file was written from)
+    return: the number of words"""
+
+    import countsyll, noun_consgrad, noundecl, verb_consgrad, verbconj
+
+    global _memoize
+
+    # store the results even if the cache was enabled with memoize=False (e.g.
+    # by load()); then restore that setting
+    memoize = _memoize
+    enable(True)
+    try:
+        wordCnt = 0
+        # in the same order as in the file, so save() writes the same bytes
+        for (word, conjs) in (
+            _read_words(filename) if words is None else sorted(words.items())
+        ):
+            wordCnt += 1
+
+            countsyll.count_syllables(word)
+            countsyll.count_syllables(word.strip("'- "))
+            if any(1 <= c <= 49 for c in conjs):
+                for decl in set(noundecl.get_declensions(word)) | conjs:
+                    if decl <= 49:
+                        noun_consgrad.get_consonant_gradation(word, decl)
+            if any(52 <= c <= 76 for c in conjs):
+                for conj in set(verbconj.get_conjugations(word)) | conjs:
+                    if conj >= 52:
+                        verb_consgrad.get_consonant_gradation(word, conj)
+    finally:
+        _memoize = memoize
+    return wordCnt
+
+def _get_source_hash():
+    # get a hex string that changes when the classifiers change
+    import hashlib
+    hasher = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in _MODULES:
+        with open(os.path.join(directory, module + ".py"), "rb") as handle:
+            hasher.update(handle.read())
+    return hasher.hexdigest()
+
+def save(filename=CACHE_FILE):
+    """Write the cache to a file (atomically).
+    return: the number of entries"""
+
+    import marshal, zlib
+
+    assert _tables is not None
+    tempFilename = filename + ".tmp"
+    with open(tempFilename, "wb") as handle:
+        handle.write(f"classcache 1 {_get_source_hash()}\n".encode("ascii"))
+        handle.write(zlib.compress(marshal.dumps(_tables), 9))
+    os.replace(tempFilename, filename)
+    return get_stats()["entries"]
+
+def load(filename=CACHE_FILE, memoize=True):
+    """Enable the cache and add the classifications from a file written by
+    save(), unless the file is missing, invalid or older than the
+    classifiers.
+    memoize: see enable()
+    return:  was the file loaded? (bool)"""
+
+    import marshal, zlib
+
+    enable(memoize)
+    try:
+        with open(filename, "rb") as handle:
+            header = handle.readline()
+            if header != f"classcache 1 {_get_source_hash()}\n".encode(
+                "ascii"
+            ):
+                return False
+            tables = marshal.loads(zlib.decompress(handle.read()))
+    except (OSError, zlib.error, EOFError, ValueError, TypeError):
+        return False
+    for name in _TABLE_NAMES:
+        _tables[name].update(tables.get(name, {}))
+    return True
+
+def main():
+    if len(sys.argv) != 1:
+        sys.exit(
+            f"Classify all words in {WORDS_FILE} and save the results to "
+            f"{CACHE_FILE} (see classcache.load()). No arguments."
+        )
+    # the classifiers use the imported module, not __main__
+    import classcache
+    wordCnt = classcache.warm_up()
+    entryCnt = classcache.save()
+    print(
+        f"Wrote {CACHE_FILE} ({wordCnt} words, {entryCnt} entries, "
+        f"{os.path.getsize(CACHE_FILE)} bytes).",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Classify many Finnish nouns or verbs at once: get their declensions/
+conjugations, whether consonant gradation applies and their syllable counts."""
+
+import sys
+from countsyll import count_syllables
+from noundecl import get_declensions
+from verbconj import get_conjugations
+from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
+from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
+
+def classify_nouns(nouns):
+    """Classify Finnish nouns. Reads the nouns one at a time, so the iterable
+    may be arbitrarily long.
+    nouns:    an iterable of nouns in nominative singular
+    generate: (noun, declensions, consGrads, syllCnt) for each noun:
+              declensions: like get_declensions() returns, e.g. (24, 27)
+              consGrads:   does consonant gradation apply in each declension
+                           (a tuple of bools)
+              syllCnt:     number of syllables (1-4; see count_syllables())"""
+
+    for noun in nouns:
+        # get_declensions() counts the syllables of the stripped noun too
+        syllCnt = count_syllables(noun.strip("'- "))
+        decls = get_declensions(noun, syllCnt=syllCnt)
+        yield (
+            noun, decls, tuple(get_noun_cons_grad(noun, d) for d in decls),
+            syllCnt
+        )
+
+def classify_verbs(verbs):
+    """Classify Finnish verbs. Reads the verbs one at a time, so the iterable
+    may be arbitrarily long.
+    verbs:    an iterable of verbs in the 1st infinitive
+    generate: (verb, conjugations, consGrads, syllCnt) for each verb:
+              conjugations: like get_conjugations() returns, e.g. (69, 75)
+              consGrads:    does consonant gradation apply in each
+                            conjugation (a tuple of bools)
+              syllCnt:      number of syllables (1-4; see count_syllables())"""
+
+    for verb in verbs:
+        # get_conjugations() counts the syllables of the stripped verb too
+        syllCnt = count_syllables(verb.strip("'- "))
+        conjs = get_conjugations(verb, syllCnt=syllCnt)
+        yield (
+            verb, conjs, tuple(get_verb_cons_grad(verb, c) for c in conjs),
+            syllCnt
+        )
+
+def main():
+    classifiers = {"n": classify_nouns, "v": classify_verbs}
+    if len(sys.argv) != 2 or sys.argv[1] not in classifiers:
+        sys.exit(
+            "Classify Finnish nouns or verbs read from stdin (one per line). "
+            "Argument: 'n' (nouns) or 'v' (verbs). Print CSV lines: "
+            "word,syllables,declension/conjugation,consonant gradation "
+            "(yes/no); one line per declension/conjugation, or just "
+            "word,syllables if unrecognized."
+        )
+
+    words = (line.rstrip("\n") for line in sys.stdin)
+    for (word, conjs, consGrads, syllCnt) in classifiers[sys.argv[1]](words):
+        if conjs:
+            for (conj, consGrad) in zip(conjs, consGrads):
+                print(f"{word},{syllCnt},{conj},{'yes' if consGrad else 'no'}")
+        else:
+            print(f"{word},{syllCnt}")
+
+if __name__ == "__main__":
+    main()
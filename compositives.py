@@ -5,18 +5,16 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
-def main():
-    if len(sys.argv) != 3:
-        sys.exit(
-            "Print words that only occur as non-final parts of compounds (not "
-            "final or alone). Arguments: compound list file, word CSV file"
-        )
-    (compoundFile, wordFile) = sys.argv[1:]
+def get_compositives(compounds, words):
+    """Get words that only occur as non-final parts of compounds (not final or
+    alone).
+    compounds: an iterable of compounds with parts separated by "_"
+    words:     an iterable of words that occur alone
+    return:    a set of words"""
 
     # get compounds as tuples
     compounds = {
-        tuple(p.strip("'- ") for p in l.split("_"))
-        for l in read_lines(compoundFile)
+        tuple(p.strip("'- ") for p in c.split("_")) for c in compounds
     }
 
     # get non-final parts of compounds
@@ -26,11 +24,24 @@ def main():
     # delete those that also occur as final parts
     compositives.difference_update(c[-1] for c in compounds)
     # delete those that also occur alone
-    compositives.difference_update(
-        l.split(",")[0] for l in read_lines(wordFile)
+    compositives.difference_update(words)
+    return compositives
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit(
+            "Print words that only occur as non-final parts of compounds (not "
+            "final or alone). Arguments: compound list file, word CSV file"
+        )
+    (compoundFile, wordFile) = sys.argv[1:]
+
+    compositives = get_compositives(
+        read_lines(compoundFile),
+        (l.split(",")[0] for l in read_lines(wordFile))
     )
 
     for word in compositives:
         print(word)
 
-main()
+if __name__ == "__main__":
+    main()
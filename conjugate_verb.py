@@ -1,6 +1,7 @@
 """Conjugate a Finnish verb. Under construction."""
 
 import re, sys
+import paradigmcache
 from verb_consgrad import get_consonant_gradation
 from verbconj import get_conjugations
 
@@ -133,11 +134,12 @@ def _consonant_gradation(verb, strengthen=False):
 # conjugations that are -tVA in infinitive and (only) -si in past
 _CONJS_TVA_SI = frozenset((54, 59, 76))  # huutaa, tuntea, taitaa
 
-def _consonant_gradation_main(verb, conj, mood, tense, voice, number, person):
-    # apply consonant gradation (after deleting infinitive -A/-CA ending)
+def _is_consonant_gradation_form(conj, mood, tense, voice, number, person):
+    # does consonant gradation happen in this form (if it applies to the verb
+    # at all)?
 
     strengthen = conj in _CONJS_STRENGTHEN
-    if (
+    return (
         mood == M_IND and voice == V_ACT
         and (tense == T_PRE or tense == T_PST and conj not in _CONJS_TVA_SI)
         and (person != P_3 or strengthen)
@@ -146,9 +148,7 @@ def _consonant_gradation_main(verb, conj, mood, tense, voice, number, person):
         or
         mood == M_IMP and tense == T_PRE and voice == V_ACT
         and number == N_SG and person == P_2
-    ):
-        return _consonant_gradation(verb, strengthen)
-    return verb
+    )
 
 # -----------------------------------------------------------------------------
 
@@ -246,10 +246,9 @@ _CHANGES_CON_PRE_ACT = _CHANGES_PST_CON | {
 }
 del _CHANGES_PST_CON
 
-def _change_ending(verb, conj, mood, tense, voice, number, person):
-    # change the ending of the verb (after consonant gradation)
+def _get_ending_change(conj, mood, tense, voice, number, person):
+    # get the (regex_from, regex_to) to apply to the verb, or None
 
-    # get regexes to apply
     if mood == M_IND and voice == V_ACT:
         if tense == T_PRE:
             changes = _CHANGES_IND_PRE_ACT.get(conj, None)
@@ -271,6 +270,12 @@ def _change_ending(verb, conj, mood, tense, voice, number, person):
     else:
         sys.exit("not implemented")
 
+    return changes
+
+def _change_ending(verb, changes):
+    # change the ending of the verb (after consonant gradation)
+    # changes: from _get_ending_change()
+
     if changes is None:
         return verb
 
@@ -358,6 +363,53 @@ def conjugate_verb_specific(
     assert (tense == T_PER) == (person is None)
     assert mood != M_IMP or number != N_SG or person != P_1
 
+    form = (mood, tense, voice, number, person)
+    if paradigmcache.is_enabled() and form in _ALL_FORMS_SET:
+        yield from conjugate_verb_paradigm_specific(verb, conj, consGrad)[form]
+        return
+
+    yield from _conjugate(verb, conj, consGrad, *form, {})
+
+def _get_stems(verb, conj, consGrad, mood, tense, voice, changes):
+    # get stems of the verb, i.e., delete the infinitive ending, apply
+    # consonant gradation, add variants, change the ending and add the ending
+    # that's common to all conjugations (but not number/person endings);
+    # consGrad: apply consonant gradation in this form? (bool)
+    # changes:  from _get_ending_change()
+    # return:   a tuple of stems
+
+    # delete ending (-VA -> -V, -CA -> -)
+    verb = re.sub("[dlnrt]?[aä]$", "", verb)
+
+    # apply consonant gradation
+    if consGrad:
+        inflected = _consonant_gradation(verb, conj in _CONJS_STRENGTHEN)
+    else:
+        inflected = verb
+
+    # get variants in a tuple, e.g. (lähdeä, läksi)
+    inflected = _get_variants(verb, inflected, conj, mood, tense)
+
+    # change ending (without adding case/number endings)
+    inflected = tuple(_change_ending(i, changes) for i in inflected)
+
+    # add the ending that's common to all conjugations
+    if mood == M_IND and tense == T_PST and voice == V_ACT:
+        inflected = tuple(i + "i" for i in inflected)
+    elif mood == M_CON and tense == T_PRE and voice == V_ACT:
+        inflected = tuple(i + "isi" for i in inflected)
+    elif mood == M_POT and tense == T_PRE and voice == V_ACT:
+        inflected = tuple(_append_pot_suffix(i) for i in inflected)
+
+    return inflected
+
+def _conjugate(
+    verb, conj, consGrad, mood, tense, voice, number, person, stems
+):
+    # generate inflected forms of a verb (see conjugate_verb_specific())
+    # stems: a cache of stems shared by the forms of a paradigm;
+    #        {(verb, conj, consGrad, mood, tense, voice, changes): stems, ...}
+
     if verb == "olla" and tense == T_PRE and voice == V_ACT:
         if mood == M_IND and person == P_3:
             # return irregular form
@@ -373,9 +425,9 @@ def conjugate_verb_specific(
         if conj == 68:
             # tupakoida: recursively get the lukea-type variant "tupakoitsea";
             # also proceed with current verb
-            yield from conjugate_verb_specific(
+            yield from _conjugate(
                 re.sub("d([aä])$", r"tse\1", verb),
-                58, consGrad, mood, tense, voice, number, person
+                58, consGrad, mood, tense, voice, number, person, stems
             )
         elif conj == 71:
             # nähdä: conjugate like a lukea-type verb
@@ -383,33 +435,19 @@ def conjugate_verb_specific(
             conj = 58
             consGrad = True
 
-    # delete ending (-VA -> -V, -CA -> -)
-    verb = re.sub("[dlnrt]?[aä]$", "", verb)
-
-    # apply consonant gradation
-    if consGrad:
-        inflected = _consonant_gradation_main(
-            verb, conj, mood, tense, voice, number, person
-        )
-    else:
-        inflected = verb
-
-    # get variants in a tuple, e.g. (lähdeä, läksi)
-    inflected = _get_variants(verb, inflected, conj, mood, tense)
-
-    # change ending (without adding case/number endings)
-    inflected = tuple(
-        _change_ending(i, conj, mood, tense, voice, number, person)
-        for i in inflected
+    # get stems (the same ones are shared by many numbers/persons)
+    consGrad = consGrad and _is_consonant_gradation_form(
+        conj, mood, tense, voice, number, person
     )
-
-    # add the ending that's common to all conjugations
-    if mood == M_IND and tense == T_PST and voice == V_ACT:
-        inflected = tuple(i + "i" for i in inflected)
-    elif mood == M_CON and tense == T_PRE and voice == V_ACT:
-        inflected = tuple(i + "isi" for i in inflected)
-    elif mood == M_POT and tense == T_PRE and voice == V_ACT:
-        inflected = tuple(_append_pot_suffix(i) for i in inflected)
+    changes = _get_ending_change(conj, mood, tense, voice, number, person)
+    key = (verb, conj, consGrad, mood, tense, voice, changes)
+    try:
+        inflected = stems[key]
+    except KeyError:
+        inflected = _get_stems(
+            verb, conj, consGrad, mood, tense, voice, changes
+        )
+        stems[key] = inflected
 
     #print(f"{inflected=} {conj=} {consGrad=}")
 
@@ -422,6 +460,21 @@ _OPTIONAL_CONS_GRAD = frozenset((
     "sulkia", "tavata"
 ))
 
+def get_cons_grads(verb, conj):
+    """Does consonant gradation apply to a verb in a conjugation, as
+    conjugate_verb() and conjugate_verb_paradigm() decide it? Unlike
+    verb_consgrad.get_consonant_gradation(), handles exceptions and verbs with
+    optional consonant gradation.
+    verb:   a verb in 1st infinitive
+    conj:   Kotus conjugation (52-76)
+    return: a tuple of one or two bools (both if optional)"""
+
+    if verb in _OPTIONAL_CONS_GRAD:
+        return (False, True)
+    if verb in ("digata", "lobata"):
+        return (True,)
+    return (get_consonant_gradation(verb, conj),)
+
 def conjugate_verb(verb, mood, tense, voice, number=None, person=None):
     """Get inflected forms of a Finnish verb. Autodetects conjugation(s) and
     whether consonant gradation applies.
@@ -449,14 +502,7 @@ def conjugate_verb(verb, mood, tense, voice, number=None, person=None):
     results = set()
 
     for conj in get_conjugations(verb):
-        if verb in _OPTIONAL_CONS_GRAD:
-            consGrads = (False, True)
-        elif verb in ("digata", "lobata"):
-            consGrads = (True,)
-        else:
-            consGrads = (get_consonant_gradation(verb, conj),)
-
-        for consGrad in consGrads:
+        for consGrad in get_cons_grads(verb, conj):
             results.update(
                 conjugate_verb_specific(
                     verb, conj, consGrad, mood, tense, voice, number, person
@@ -501,11 +547,102 @@ ALL_FORMS = (
     (M_IMP, T_PRE, V_ACT, N_PL, P_3),
 )
 
+_ALL_FORMS_SET = frozenset(ALL_FORMS)
+
+def _get_paradigm(verb, conj, consGrad):
+    # see conjugate_verb_paradigm_specific()
+    stems = {}
+    return dict(
+        (form, tuple(_conjugate(verb, conj, consGrad, *form, stems)))
+        for form in ALL_FORMS
+    )
+
+def conjugate_verb_paradigm_specific(verb, conj, consGrad):
+    """Get inflected forms of a Finnish verb in all supported combinations of
+    mood, tense, voice, number and person. Faster than calling
+    conjugate_verb_specific() for each of them because the stems are shared.
+    verb:     a verb in 1st infinitive (str)
+    conj:     Kotus conjugation (52-76)
+    consGrad: does consonant gradation apply in certain cases/numbers? (bool)
+    return:   {(mood, tense, voice, number, person): tuple of inflected forms,
+              ...} in the order of ALL_FORMS; from paradigmcache if enabled"""
+
+    assert isinstance(verb, str)
+    assert 52 <= conj <= 76
+    assert isinstance(consGrad, bool)
+
+    return paradigmcache.get_paradigm(
+        ("verb", verb, conj, consGrad), _get_paradigm, verb, conj, consGrad
+    )
+
+def conjugate_verb_paradigm(verb, conjs=None):
+    """Get inflected forms of a Finnish verb in all supported combinations of
+    mood, tense, voice, number and person. Autodetects conjugation(s) unless
+    given and whether consonant gradation applies.
+    verb:   a verb in 1st infinitive
+    conjs:  Kotus conjugations (52-76) if known, e.g. from verbs.csv
+    return: {(mood, tense, voice, number, person): set of inflected forms, ...}
+            in the order of ALL_FORMS (the sets are empty if the verb was not
+            recognized)"""
+
+    assert isinstance(verb, str)
+
+    paradigm = dict((f, set()) for f in ALL_FORMS)
+
+    if conjs is None:
+        conjs = get_conjugations(verb)
+    for conj in conjs:
+        for consGrad in get_cons_grads(verb, conj):
+            for (form, inflected) in conjugate_verb_paradigm_specific(
+                verb, conj, consGrad
+            ).items():
+                paradigm[form].update(inflected)
+
+    return paradigm
+
 def _items_to_str(items):
     # format a list of e.g. moods
     return "/".join(ITEM_NAMES[i] for i in items)
 
+def _print_paradigms_tsv(lines):
+    # conjugate verbs read from lines (CSV: verb[,conjugation...]); print tab-
+    # separated lines: verb, form name (e.g. "ind-pre-act-sg-1"), inflected
+    # form
+
+    formNames = dict(
+        (f, "-".join(ITEM_NAMES[i] for i in f)) for f in ALL_FORMS
+    )
+
+    for (lineNo, line) in enumerate(lines, 1):
+        fields = line.rstrip("\n").split(",")
+        verb = fields[0]
+        if not verb:
+            continue
+        try:
+            conjs = [int(c, 10) for c in fields[1:]]
+            if not all(52 <= c <= 76 for c in conjs):
+                raise ValueError
+        except ValueError:
+            sys.exit(f"Invalid conjugation on line {lineNo}.")
+
+        paradigm = conjugate_verb_paradigm(verb, conjs or None)
+        rows = []
+        for (form, conjugatedVerbs) in paradigm.items():
+            # sort variants by length
+            conjugatedVerbs = sorted(conjugatedVerbs)
+            conjugatedVerbs.sort(key=lambda v: len(v))
+            rows.extend(
+                f"{verb}\t{formNames[form]}\t{v}\n" for v in conjugatedVerbs
+            )
+        if not rows:
+            print(f"Unrecognized verb: {verb}", file=sys.stderr)
+        sys.stdout.write("".join(rows))
+
 def main():
+    if sys.argv[1:] == ["--stdin"]:
+        _print_paradigms_tsv(sys.stdin)
+        return
+
     if len(sys.argv) not in (2, 5, 6, 7):
         sys.exit(
             "Conjugate a Finnish verb. "
@@ -515,7 +652,11 @@ def main():
             f"Voices: {_items_to_str(VOICES)}. "
             f"Numbers: {_items_to_str(NUMBERS)}. "
             f"Persons: {_items_to_str(PERSONS)}. "
-            "If 1 argument only, print all supported combinations."
+            "If 1 argument only, print all supported combinations. "
+            "Or --stdin: read verbs from stdin, one per line, optionally "
+            "followed by comma-separated conjugations (like verbs.csv); print "
+            "all forms as tab-separated lines: verb, form (e.g. "
+            "ind-pre-act-sg-1), inflected form."
         )
 
     verb = sys.argv[1]
@@ -534,7 +675,7 @@ def main():
     del argToItem
 
     if mood is None:
-        formsToPrint = ALL_FORMS
+        paradigm = conjugate_verb_paradigm(verb)
     else:
         if mood not in MOODS:
             sys.exit("Invalid mood.")
@@ -566,11 +707,12 @@ def main():
         if mood == M_IMP and number == N_SG and person == P_1:
             sys.exit("1st person singular forbidden with imperative mood.")
 
-        formsToPrint = ((mood, tense, voice, number, person),)
+        form = (mood, tense, voice, number, person)
+        paradigm = {form: conjugate_verb(verb, *form)}
 
-    for form in formsToPrint:
+    for (form, conjugatedVerbs) in paradigm.items():
         # sort variants by length
-        conjugatedVerbs = sorted(conjugate_verb(verb, *form))
+        conjugatedVerbs = sorted(conjugatedVerbs)
         conjugatedVerbs.sort(key=lambda v: len(v))
         if not conjugatedVerbs:
             sys.exit("Unrecognized verb.")
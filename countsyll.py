@@ -3,6 +3,7 @@
 # Note: A = a/ä, O = o/ö, U = u/y, V = any vowel, C = one or more consonants.
 
 import re, sys
+import classcache
 
 # regex snippets from which the rules are assembled
 
@@ -132,12 +133,8 @@ _EXCEPTIONS_3SYLL = frozenset((
     "vinaigrette",
 ))
 
-def count_syllables(word, useExceptions=True):
-    """Count the number of syllables in a Finnish word.
-    word:          the word
-    useExceptions: use True except for testing purposes
-    return:        the number of syllables (1-4; 4 means 4 or more syllables
-                   or an unknown word)"""
+def _count_syllables(word, useExceptions):
+    # see count_syllables()
 
     if useExceptions:
         if word in _EXCEPTIONS_1SYLL:
@@ -157,6 +154,17 @@ def count_syllables(word, useExceptions=True):
         return 3
     return 4
 
+def count_syllables(word, useExceptions=True):
+    """Count the number of syllables in a Finnish word.
+    word:          the word
+    useExceptions: use True except for testing purposes
+    return:        the number of syllables (1-4; 4 means 4 or more syllables
+                   or an unknown word); from classcache if enabled"""
+
+    if not useExceptions:
+        return _count_syllables(word, False)
+    return classcache.get("syllables", word, _count_syllables, word, True)
+
 def _get_redundant_exceptions():
     # generate words that are unnecessarily on the exceptions list
     for excList in (_EXCEPTIONS_1SYLL, _EXCEPTIONS_2SYLL, _EXCEPTIONS_3SYLL):
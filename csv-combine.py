@@ -5,6 +5,25 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
+def read_csv(filename):
+    # return: {word: set of declensions/conjugations, ...}
+    words = {}
+    for line in read_lines(filename):
+        fields = line.split(",")
+        words.setdefault(fields[0], set()).update(int(v) for v in fields[1:])
+    return words
+
+def combine(*tables):
+    """Combine the declensions/conjugations of each word.
+    tables: {word: set of declensions/conjugations, ...}
+    return: {word: set of all declensions/conjugations in tables, ...}"""
+
+    conjugationsByWord = {}  # {word: set of conjugations, ...}
+    for table in tables:
+        for (word, conjugations) in table.items():
+            conjugationsByWord.setdefault(word, set()).update(conjugations)
+    return conjugationsByWord
+
 def main():
     if len(sys.argv) < 2:
         sys.exit(
@@ -14,18 +33,12 @@ def main():
         )
     filenames = sys.argv[1:]
 
-    conjugationsByWord = {}  # {word: set of conjugations, ...}
-
-    for filename in filenames:
-        for line in read_lines(filename):
-            fields = line.split(",")
-            word = fields[0]
-            conjugations = {int(v) for v in fields[1:]}
-            conjugationsByWord.setdefault(word, set()).update(conjugations)
+    conjugationsByWord = combine(*(read_csv(f) for f in filenames))
 
     for word in sorted(conjugationsByWord):
         print(",".join(
             [word] + [str(c) for c in sorted(conjugationsByWord[word])]
         ))
 
-main()
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Decline a Finnish noun."""
 
 import re, sys
+import paradigmcache
 from noun_consgrad import get_consonant_gradation
 from noundecl import get_declensions
 
@@ -197,6 +198,29 @@ _CHANGES_INE_PL = _CHANGES_GEN_PL_INE_PL | {
 }
 del _CHANGES_GEN_PL_INE_PL
 
+def _compile_changes(changes):
+    # compile the regexes in a dict of ending changes
+    # changes: {declension: ((regex_from, regex_to), ...), ...}
+    # return:  {declension: ((compiled_regex_from, regex_to), ...), ...}
+    return dict(
+        (d, tuple((re.compile(f + "$"), t) for (f, t) in c))
+        for (d, c) in changes.items()
+    )
+
+# compiled ending changes by case/number and declension
+# - format: {(case, number): {declension: ((regex_from, regex_to), ...), ...}}
+# - nominative singular is not here; it never changes
+_CHANGES_BY_FORM = dict(
+    ((c, n), changes)
+    for (forms, changes) in (
+        (_CASES_END_CHG_GEN_SG, _compile_changes(_CHANGES_GEN_SG)),
+        (_CASES_END_CHG_INE_PL, _compile_changes(_CHANGES_INE_PL)),
+        (((C_GEN, N_PL),),      _compile_changes(_CHANGES_GEN_PL)),
+        (((C_PAR, N_SG),),      _compile_changes(_CHANGES_PAR_SG)),
+    )
+    for (c, n) in forms
+)
+
 def _change_ending(word, decl, case, number):
     # change the ending of the word (before applying consonant gradation or
     # adding case/number endings)
@@ -208,22 +232,16 @@ def _change_ending(word, decl, case, number):
         word = "velji"
 
     # get regexes to apply
-    if (case, number) in _CASES_END_CHG_GEN_SG:
-        changes = _CHANGES_GEN_SG.get(decl, ())
-    elif (case, number) in _CASES_END_CHG_INE_PL:
-        changes = _CHANGES_INE_PL.get(decl, ())
-    elif case == C_GEN and number == N_PL:
-        changes = _CHANGES_GEN_PL.get(decl, ())
-    elif case == C_PAR and number == N_SG:
-        changes = _CHANGES_PAR_SG.get(decl, ())
-    else:
+    try:
+        changes = _CHANGES_BY_FORM[(case, number)].get(decl, ())
+    except KeyError:
         sys.exit("error")
 
     # apply the first regex that matches
     for (regexFrom, regexTo) in changes:
-        regexFrom += "$"
-        if re.search(regexFrom, word) is not None:
-            return re.sub(regexFrom, regexTo, word)
+        (word, count) = regexFrom.subn(regexTo, word, 1)
+        if count:
+            break
     return word
 
 # -----------------------------------------------------------------------------
@@ -744,38 +762,35 @@ ALL_FORMS = (
     (C_INS, N_PL),
 )
 
-def decline_noun_specific(word, decl, consGrad, case, number):
-    """Get inflected forms of a Finnish noun.
-    word:     a noun in nominative singular (str)
-    decl:     Kotus declension (1-49)
-    consGrad: does consonant gradation apply in certain cases/numbers? (bool)
-    case:     grammatical case (see CASES)
-    number:   grammatical number (see NUMBERS)
-    generate: inflected forms of word"""
-
-    assert isinstance(word, str)
-    assert 1 <= decl <= 49
-    assert isinstance(consGrad, bool)
-    assert case in CASES
-    assert number in NUMBERS
-    assert (case, number) in ALL_FORMS
+# cases/numbers that share the same stem, i.e., the same ending change and
+# consonant gradation (nominative singular is not listed)
+_STEM_GROUPS = (
+    _CASES_LIKE_GEN_SG,                           # e.g. pata:pada-
+    frozenset(((C_ESS, N_SG), (C_ILL, N_SG))),    # e.g. pata:pata-
+    _CASES_LIKE_INE_PL,                           # e.g. pata:pado-
+    _CASES_LIKE_PAR_PL,                           # e.g. pata:pato-
+    frozenset(((C_GEN, N_PL),)),                  # e.g. pata:pato-
+    frozenset(((C_PAR, N_SG),)),                  # e.g. pata:pata-
+)
+assert sorted(f for g in _STEM_GROUPS for f in g) \
+== sorted(set(ALL_FORMS) - {(C_NOM, N_SG)})
 
-    # exit early for nominative singular
-    if case == C_NOM and number == N_SG:
-        yield word
-        return
+def _get_stem(word, decl, consGrad, case, number):
+    # get the stem of the word, i.e., change the ending and apply consonant
+    # gradation (without adding variants or case/number endings);
+    # the stem is the same for all cases/numbers in each of _STEM_GROUPS
 
-    # change ending (without adding case/number endings)
     inflected = _change_ending(word, decl, case, number)
-
-    # apply consonant gradation
-    inflected = _consonant_gradation_main(
+    return _consonant_gradation_main(
         word, inflected, decl, consGrad, case, number
     )
 
+def _decline_stem(word, stem, decl, consGrad, case, number):
+    # generate inflected forms from a stem (see _get_stem())
+
     # add variant if there's one
-    variant = _get_word_variant(word, inflected, decl, case, number)
-    inflected = [inflected]
+    variant = _get_word_variant(word, stem, decl, case, number)
+    inflected = [stem]
     if variant is not None:
         inflected.append(variant)
     del variant
@@ -803,6 +818,82 @@ def decline_noun_specific(word, decl, consGrad, case, number):
     else:
         sys.exit("error")
 
+def decline_noun_specific(word, decl, consGrad, case, number):
+    """Get inflected forms of a Finnish noun.
+    word:     a noun in nominative singular (str)
+    decl:     Kotus declension (1-49)
+    consGrad: does consonant gradation apply in certain cases/numbers? (bool)
+    case:     grammatical case (see CASES)
+    number:   grammatical number (see NUMBERS)
+    generate: inflected forms of word"""
+
+    assert isinstance(word, str)
+    assert 1 <= decl <= 49
+    assert isinstance(consGrad, bool)
+    assert case in CASES
+    assert number in NUMBERS
+    assert (case, number) in ALL_FORMS
+
+    # exit early for nominative singular
+    if case == C_NOM and number == N_SG:
+        yield word
+        return
+
+    if paradigmcache.is_enabled():
+        yield from decline_noun_paradigm_specific(word, decl, consGrad)[
+            (case, number)
+        ]
+        return
+
+    stem = _get_stem(word, decl, consGrad, case, number)
+    yield from _decline_stem(word, stem, decl, consGrad, case, number)
+
+def _get_paradigm(word, decl, consGrad):
+    # see decline_noun_paradigm_specific()
+
+    paradigm = {(C_NOM, N_SG): (word,)}
+
+    for forms in _STEM_GROUPS:
+        stem = None
+        for (case, number) in forms:
+            if stem is None:
+                stem = _get_stem(word, decl, consGrad, case, number)
+            paradigm[(case, number)] = tuple(
+                _decline_stem(word, stem, decl, consGrad, case, number)
+            )
+
+    return dict((f, paradigm[f]) for f in ALL_FORMS)
+
+def decline_noun_paradigm_specific(word, decl, consGrad):
+    """Get inflected forms of a Finnish noun in all supported cases and
+    numbers. Faster than calling decline_noun_specific() for each of them
+    because each stem is only computed once.
+    word:     a noun in nominative singular (str)
+    decl:     Kotus declension (1-49)
+    consGrad: does consonant gradation apply in certain cases/numbers? (bool)
+    return:   {(case, number): tuple of inflected forms, ...} in the order of
+              ALL_FORMS; from paradigmcache if enabled"""
+
+    assert isinstance(word, str)
+    assert 1 <= decl <= 49
+    assert isinstance(consGrad, bool)
+
+    return paradigmcache.get_paradigm(
+        ("noun", word, decl, consGrad), _get_paradigm, word, decl, consGrad
+    )
+
+def get_cons_grad(word, decl):
+    """Does consonant gradation apply to a noun in a declension, as
+    decline_noun() and decline_noun_paradigm() decide it? Unlike
+    noun_consgrad.get_consonant_gradation(), handles exceptions.
+    word:   a noun in nominative singular (str)
+    decl:   Kotus declension (1-49)
+    return: bool"""
+
+    if word in ("häive", "viive"):
+        return False  # optional consonant gradation
+    return get_consonant_gradation(word, decl)
+
 def decline_noun(word, case, number):
     """Get inflected forms of a Finnish noun. Autodetects declension(s) and
     whether consonant gradation applies.
@@ -820,17 +911,72 @@ def decline_noun(word, case, number):
     results = set()
 
     for decl in get_declensions(word):
-        if word in ("häive", "viive"):
-            consGrad = False  # optional consonant gradation
-        else:
-            consGrad = get_consonant_gradation(word, decl)
+        consGrad = get_cons_grad(word, decl)
         results.update(
             decline_noun_specific(word, decl, consGrad, case, number)
         )
 
     return results
 
+def decline_noun_paradigm(word, decls=None):
+    """Get inflected forms of a Finnish noun in all supported cases and
+    numbers. Autodetects declension(s) unless given and whether consonant
+    gradation applies.
+    word:   a noun in nominative singular (str)
+    decls:  Kotus declensions (1-49) if known, e.g. from nouns.csv
+    return: {(case, number): set of inflected forms, ...} in the order of
+            ALL_FORMS (the sets are empty if the noun was not recognized)"""
+
+    assert isinstance(word, str)
+
+    paradigm = dict((f, set()) for f in ALL_FORMS)
+
+    if decls is None:
+        decls = get_declensions(word)
+    for decl in decls:
+        consGrad = get_cons_grad(word, decl)
+        for (form, inflected) in decline_noun_paradigm_specific(
+            word, decl, consGrad
+        ).items():
+            paradigm[form].update(inflected)
+
+    return paradigm
+
+def _print_paradigms_tsv(lines):
+    # decline nouns read from lines (CSV: noun[,declension...]); print tab-
+    # separated lines: noun, form name (e.g. "gen-pl"), inflected form
+
+    formNames = dict(
+        ((c, n), f"{ITEM_NAMES[c]}-{ITEM_NAMES[n]}") for (c, n) in ALL_FORMS
+    )
+
+    for (lineNo, line) in enumerate(lines, 1):
+        fields = line.rstrip("\n").split(",")
+        word = fields[0]
+        if not word:
+            continue
+        try:
+            decls = [int(d, 10) for d in fields[1:]]
+            if not all(1 <= d <= 49 for d in decls):
+                raise ValueError
+        except ValueError:
+            sys.exit(f"Invalid declension on line {lineNo}.")
+
+        paradigm = decline_noun_paradigm(word, decls or None)
+        rows = [
+            f"{word}\t{formNames[f]}\t{i}\n"
+            for (f, declinedNouns) in paradigm.items()
+            for i in sorted(declinedNouns)
+        ]
+        if not rows:
+            print(f"Unrecognized noun: {word}", file=sys.stderr)
+        sys.stdout.write("".join(rows))
+
 def main():
+    if sys.argv[1:] == ["--stdin"]:
+        _print_paradigms_tsv(sys.stdin)
+        return
+
     if len(sys.argv) == 2:
         word = sys.argv[1]
         allCases = True
@@ -857,19 +1003,19 @@ def main():
             "Decline a Finnish noun. Arguments: NOUN [CASE NUMBER]. Cases: "
             + "/".join(ITEM_NAMES[c] for c in CASES) + ". Numbers: "
             + "/".join(ITEM_NAMES[n] for n in NUMBERS) + ". "
-            + "If case & number omitted, print all supported combinations."
+            + "If case & number omitted, print all supported combinations. "
+            + "Or --stdin: read nouns from stdin, one per line, optionally "
+            + "followed by comma-separated declensions (like nouns.csv); "
+            + "print all forms as tab-separated lines: noun, form (e.g. "
+            + "gen-pl), inflected form."
         )
 
     if allCases:
-        casesAndNumbers = (
-            (c, n) for c in CASES for n in NUMBERS
-            if not (c == C_INS and n == N_SG)
-        )
+        paradigm = decline_noun_paradigm(word)
     else:
-        casesAndNumbers = ((case, number),)
+        paradigm = {(case, number): decline_noun(word, case, number)}
 
-    for (c, n) in casesAndNumbers:
-        declinedNouns = set(decline_noun(word, c, n))
+    for ((c, n), declinedNouns) in paradigm.items():
         if not declinedNouns:
             sys.exit("Unrecognized noun.")
         print(
@@ -0,0 +1,126 @@
+"""Convert the Kotus XML file into the files that the other programs need, like
+extract.sh, but in one process."""
+
+# The steps are the same as in extract.sh and use the same functions as its
+# programs (e.g. finals.get_finals()), but each one takes and returns a table
+# ({word: set of declensions/conjugations, ...}) instead of reading and
+# writing a CSV file. Each input file is read once and each output file is
+# written once, at the end; the files that are built from other output files
+# (e.g. lexicon.bin) are built from the tables instead of reading them back.
+# Warning: overwrites files.
+
+import importlib, locale, os, sys
+import classcache, compositives, finals, lexicon, nonfinals, splitcomp, xml2csv
+from analyze_word import generate_table_analyses
+
+XML_FILE = "kotus-sanalista_v1.xml"
+COMPOUND_FILE = "compounds.txt"
+PLURAL_FILE = "plurals.csv"
+STATS_FILE = "stats-nounverb.txt"
+
+def read_lines(filename):
+    with open(filename, "rt", encoding="utf8") as handle:
+        handle.seek(0)
+        yield from (l.rstrip("\n") for l in handle)
+
+def write_lines(filename, lines):
+    with open(filename, "wt", encoding="utf8") as handle:
+        handle.seek(0)
+        for line in lines:
+            print(line, file=handle)
+
+def to_csv_lines(words):
+    # generate CSV lines sorted by word (like the programs print them)
+    for word in sorted(words):
+        yield ",".join([word] + [str(c) for c in sorted(words[word])])
+
+def sort_lines(lines):
+    # sort lines like sort(1) does in the current locale (extract.sh pipes
+    # some outputs through it): by collation, then by code point
+    return sorted(lines, key=lambda l: (locale.strxfrm(l), l))
+
+def main():
+    if len(sys.argv) != 1:
+        sys.exit(
+            "Convert the Kotus XML file into the CSV and other files that the "
+            "other programs need, like extract.sh, but in one process. No "
+            f"arguments. Run in the project directory; needs {XML_FILE}. "
+            "Warning: overwrites files."
+        )
+
+    locale.setlocale(locale.LC_COLLATE, "")
+
+    # the programs whose names are not valid identifiers
+    csvCombine = importlib.import_module("csv-combine")
+    replacePlurals = importlib.import_module("replace-plurals")
+    stripCompounds = importlib.import_module("strip-compounds")
+    filterByConj = importlib.import_module("filter-by-conjugation")
+    filterBySyllCnt = importlib.import_module("filter-by-syllcnt")
+    statsNounVerb = importlib.import_module("stats-nounverb")
+
+    print("Reading input files...", file=sys.stderr)
+    (origWords, consGradWords) = xml2csv.get_word_tables(XML_FILE)
+    compounds = list(read_lines(COMPOUND_FILE))
+    singularsByPlural = replacePlurals.get_singulars_by_plural(PLURAL_FILE)
+
+    print("Processing words...", file=sys.stderr)
+    # add words that only occur as finals of compounds; replace (non-compound)
+    # plurals with singulars and delete compounds
+    finalWords = finals.get_finals(origWords, compounds)
+    words = stripCompounds.strip_compounds(replacePlurals.replace_plurals(
+        csvCombine.combine(origWords, finalWords), singularsByPlural
+    ), compounds)
+    consGradWords = stripCompounds.strip_compounds(
+        replacePlurals.replace_plurals(csvCombine.combine(
+            consGradWords, finals.get_finals(consGradWords, compounds)
+        ), singularsByPlural),
+        compounds
+    )
+    # separate nouns and verbs
+    nouns = filterByConj.filter_by_conjugation(words, 1, 49)
+    verbs = filterByConj.filter_by_conjugation(words, 52, 76)
+
+    # {filename_under_generated-lists: lines, ...}
+    outputs = {
+        "words-orig.csv": to_csv_lines(origWords),
+        "finals.csv": sort_lines(to_csv_lines(finalWords)),
+        "words.csv": to_csv_lines(words),
+        "words-consgrad.csv": to_csv_lines(consGradWords),
+        "nouns.csv": to_csv_lines(nouns),
+        "verbs.csv": to_csv_lines(verbs),
+    }
+    # group by number of syllables
+    for syllCnt in range(1, 5):
+        for (pos, table) in (("noun", nouns), ("verb", verbs)):
+            outputs[f"{pos}s-{syllCnt}syll.csv"] = to_csv_lines(
+                filterBySyllCnt.filter_by_syllable_count(table, syllCnt)
+            )
+    outputs["nonfinals.txt"] = sort_lines(nonfinals.get_nonfinals(compounds))
+    outputs["compositives.txt"] = sort_lines(
+        compositives.get_compositives(compounds, words)
+    )
+
+    os.makedirs("generated-lists", exist_ok=True)
+    for (filename, lines) in outputs.items():
+        print(f"Writing {filename}...", file=sys.stderr)
+        write_lines("generated-lists/" + filename, lines)
+
+    # these are built from the tables above instead of the files (the
+    # splitcomp snapshot is stamped with the files, so they must exist)
+    print("Writing splitcomp-words.bin...", file=sys.stderr)
+    splitcomp.build_snapshot(outputs["nonfinals.txt"], finalWords)
+    # the cache also speeds up the lexicon
+    print("Writing classcache.bin...", file=sys.stderr)
+    classcache.warm_up(words=words)
+    classcache.save()
+    print("Writing lexicon.bin...", file=sys.stderr)
+    lexicon.write_lexicon(lexicon.LEXICON_FILE, generate_table_analyses(
+        ((n, sorted(nouns[n])) for n in sorted(nouns)),
+        ((v, sorted(verbs[v])) for v in sorted(verbs))
+    ))
+
+    print(f"Writing {STATS_FILE}...", file=sys.stderr)
+    write_lines(STATS_FILE, statsNounVerb.get_table(to_csv_lines(words)))
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,8 @@
 mkdir -p generated-lists
 
 echo "Converting the Kotus XML file into CSV files..."
-python3 xml2csv.py kotus-sanalista_v1.xml a > generated-lists/words-orig.csv
-python3 xml2csv.py kotus-sanalista_v1.xml g \
-    > generated-lists/words-consgrad.csv
+python3 xml2csv.py kotus-sanalista_v1.xml generated-lists/words-orig.csv \
+    generated-lists/words-consgrad.csv
 
 echo "Adding words that only occur as finals of compounds..."
 python3 finals.py generated-lists/words-orig.csv compounds.txt | sort \
@@ -55,6 +54,15 @@ echo "Writing compositives.txt..."
 python3 compositives.py compounds.txt generated-lists/words.csv | sort \
     > generated-lists/compositives.txt
 
+echo "Writing splitcomp-words.bin..."
+python3 splitcomp.py --build
+
+echo "Writing classcache.bin..."
+python3 classcache.py
+
+echo "Writing lexicon.bin..."
+python3 lexicon.py
+
 echo "generated-lists/:"
 ls -l generated-lists/
 
@@ -5,6 +5,28 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
+def read_csv(filename):
+    # return: {word: set of declensions/conjugations, ...} in file order
+    words = {}
+    for line in read_lines(filename):
+        fields = line.split(",")
+        words.setdefault(fields[0], set()).update(int(c) for c in fields[1:])
+    return words
+
+def filter_by_conjugation(words, first, last):
+    """Get words with declensions/conjugations within a range.
+    words:  {word: set of declensions/conjugations, ...}
+    first:  first declension/conjugation
+    last:   last declension/conjugation
+    return: {word: set of declensions/conjugations within the range, ...} in
+            the same order"""
+
+    conjsToExtract = set(range(first, last + 1))
+    return dict(
+        (w, c & conjsToExtract) for (w, c) in words.items()
+        if c & conjsToExtract
+    )
+
 def main():
     if len(sys.argv) != 4:
         sys.exit(
@@ -13,13 +35,12 @@ def main():
             "lines that contain declensions/conjugations within that range."
         )
     filename = sys.argv[1]
-    conjsToExtract = [int(c) for c in sys.argv[2:]]
-    conjsToExtract = set(range(conjsToExtract[0], conjsToExtract[1] + 1))
+    (first, last) = (int(c) for c in sys.argv[2:])
 
-    for line in read_lines(filename):
-        fields = line.split(",")
-        conjs = {int(c) for c in fields[1:]} & conjsToExtract
-        if conjs:
-            print(",".join([fields[0]] + [str(c) for c in sorted(conjs)]))
+    words = filter_by_conjugation(read_csv(filename), first, last)
+
+    for (word, conjs) in words.items():
+        print(",".join([word] + [str(c) for c in sorted(conjs)]))
 
-main()
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,28 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
+def read_csv(filename):
+    # return: {word: set of declensions/conjugations, ...} in file order
+    words = {}
+    for line in read_lines(filename):
+        fields = line.split(",")
+        words.setdefault(fields[0], set()).update(
+            int(c, 10) for c in fields[1:]
+        )
+    return words
+
+def filter_by_syllable_count(words, syllCnt):
+    """Get words with a syllable count.
+    words:   {word: set of declensions/conjugations, ...}
+    syllCnt: 1-4 (4 = 4 or more; see countsyll.count_syllables())
+    return:  {word: set of declensions/conjugations, ...} in the same order"""
+
+    assert 1 <= syllCnt <= 4
+    return dict(
+        (w, c) for (w, c) in words.items()
+        if countsyll.count_syllables(w) == syllCnt
+    )
+
 def main():
     if len(sys.argv) != 3:
         sys.exit(
@@ -16,8 +38,10 @@ def main():
     syllCnt = int(sys.argv[2], 10)
     assert 1 <= syllCnt <= 4
 
-    for line in read_lines(sys.argv[1]):
-        if countsyll.count_syllables(line.split(",")[0]) == syllCnt:
-            print(line)
+    words = filter_by_syllable_count(read_csv(sys.argv[1]), syllCnt)
+
+    for (word, conjs) in words.items():
+        print(",".join([word] + [str(c) for c in sorted(conjs)]))
 
-main()
+if __name__ == "__main__":
+    main()
@@ -5,34 +5,49 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
-def main():
-    if len(sys.argv) != 3:
-        sys.exit(
-            "Get words that occur as finals of compounds. Print them and "
-            "their declensions/conjugations in CSV format. Arguments: "
-            "wordCsvFile compoundListFile"
-        )
-    (wordFile, compoundFile) = sys.argv[1:]
+def read_csv(filename):
+    # return: {word: set of declensions/conjugations, ...}
+    words = {}
+    for line in read_lines(filename):
+        fields = line.split(",")
+        words.setdefault(fields[0], set()).update(int(c) for c in fields[1:])
+    return words
+
+def get_finals(words, compounds):
+    """Get words that occur as finals of compounds.
+    words:     {word: set of declensions/conjugations, ...}
+    compounds: an iterable of compounds with parts separated by "_"
+    return:    {final: set of declensions/conjugations, ...}"""
 
     # get the final part for each compound
     compoundToFinal = {}  # e.g. {"putkiyhde": "yhde", ...}
-    for word in read_lines(compoundFile):
+    for word in compounds:
         compoundToFinal[word.replace("_", "")] \
         = word.split("_")[-1].strip("'- ")
 
     # get conjugations for finals
     conjsByFinal = {}  # e.g. {"yhde": {48}, ...}
-    for line in read_lines(wordFile):
-        fields = line.split(",")
-        word = fields[0]
+    for (word, conjs) in words.items():
         if word in compoundToFinal:
             final = compoundToFinal[word]
-            conjs = {int(c) for c in fields[1:]} - {50, 51}
-            conjsByFinal.setdefault(final, set()).update(conjs)
+            conjsByFinal.setdefault(final, set()).update(conjs - {50, 51})
+    return conjsByFinal
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit(
+            "Get words that occur as finals of compounds. Print them and "
+            "their declensions/conjugations in CSV format. Arguments: "
+            "wordCsvFile compoundListFile"
+        )
+    (wordFile, compoundFile) = sys.argv[1:]
+
+    conjsByFinal = get_finals(read_csv(wordFile), read_lines(compoundFile))
 
     for final in sorted(conjsByFinal):
         print(",".join(
             [final] + [str(c) for c in sorted(conjsByFinal.get(final, {}))]
         ))
 
-main()
+if __name__ == "__main__":
+    main()
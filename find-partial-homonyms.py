@@ -1,96 +1,239 @@
-# Find partially homonymous inflected words. Slow.
+# Find partially homonymous inflected words. Slow; the work can be split
+# between several processes.
 
-import sys
+import contextlib, heapq, itertools, multiprocessing, os, sys, tempfile, zlib
 from noundecl import get_declensions
 from verbconj import get_conjugations
 from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
 from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
-from decline_noun import decline_noun_specific, \
-ALL_FORMS as ALL_NOUN_FORMS, ITEM_NAMES as NOUN_ITEM_NAMES
-from conjugate_verb import conjugate_verb_specific, \
-ALL_FORMS as ALL_VERB_FORMS, ITEM_NAMES as VERB_ITEM_NAMES
+from decline_noun import decline_noun_paradigm_specific
+from conjugate_verb import conjugate_verb_paradigm_specific
+
+SHARD_SIZE = 250       # lemmas per unit of work
+PARTITION_COUNT = 16   # inflected forms are merged in this many groups
+# estimated memory use of one inflected form with its lemma in bytes (for the
+# external sort mode)
+BYTES_PER_RECORD = 250
 
 def status_msg(msg):
     # print a status message to stderr (won't be redirected to output file)
     print(msg, file=sys.stderr)
 
 def get_lemmas(filename):
-    # generate lemmas (uninflected forms)
+    # read lemmas (uninflected forms) and their declensions/conjugations from
+    # a CSV file
+    # return: {lemma: tuple of declensions/conjugations, ...}; the tuple is
+    # empty if the file has none for the lemma
+    lemmas = {}
     with open(filename, "rt", encoding="utf8") as handle:
         handle.seek(0)
-        yield from (l.split(",")[0] for l in handle)
+        for line in handle:
+            fields = line.rstrip("\n").split(",")
+            lemmas.setdefault(fields[0], set()).update(
+                int(c, 10) for c in fields[1:] if c
+            )
+    return dict((l, tuple(sorted(c))) for (l, c) in lemmas.items())
 
-def group_noun_lemmas(lemmas, lemmasByInflected):
-    # group noun lemmas by inflected forms
-    # lemmasByInflected/return: {inflected: {(declension, lemma), ...}, ...}
+def get_shards(nounLemmas, verbLemmas):
+    # generate units of work: (shard_number, is_verb, lemmas); lemmas: a list
+    # of (lemma, declensions/conjugations)
+    shardNo = 0
+    for (isVerb, lemmas) in ((False, nounLemmas), (True, verbLemmas)):
+        lemmas = sorted(lemmas.items())
+        for i in range(0, len(lemmas), SHARD_SIZE):
+            yield (shardNo, isVerb, lemmas[i:i+SHARD_SIZE])
+            shardNo += 1
 
-    for form in ALL_NOUN_FORMS:
-        # (case, number)
-        status_msg(
-            "Generating forms: " + "-".join(NOUN_ITEM_NAMES[i] for i in form)
-            + "..."
-        )
-        for lemma in lemmas:
-            for decl in get_declensions(lemma):
-                consGrad = get_noun_cons_grad(lemma, decl)
-                for inflected in (
-                    decline_noun_specific(lemma, decl, consGrad, *form)
-                ):
-                    lemmasByInflected.setdefault(inflected, set()).add(
-                        (decl, lemma)
-                    )
+def generate_noun_forms(lemmas):
+    # generate (inflected, declension, lemma)
+    # lemmas: (lemma, declensions); the declensions are only detected if
+    # there are none
+    for (lemma, decls) in lemmas:
+        for decl in decls or get_declensions(lemma):
+            consGrad = get_noun_cons_grad(lemma, decl)
+            for forms in decline_noun_paradigm_specific(
+                lemma, decl, consGrad
+            ).values():
+                for inflected in forms:
+                    yield (inflected, decl, lemma)
 
-    return lemmasByInflected
+def generate_verb_forms(lemmas):
+    # generate (inflected, conjugation, lemma); includes the lemma forms
+    # lemmas: (lemma, conjugations); the conjugations are only detected if
+    # there are none
+    for (lemma, conjs) in lemmas:
+        for conj in conjs or get_conjugations(lemma):
+            yield (lemma, conj, lemma)
+            consGrad = get_verb_cons_grad(lemma, conj)
+            for forms in conjugate_verb_paradigm_specific(
+                lemma, conj, consGrad
+            ).values():
+                for inflected in forms:
+                    yield (inflected, conj, lemma)
+
+def get_partition(inflected):
+    # which partition an inflected form belongs to; unlike hash(), gives the
+    # same result in all processes
+    return zlib.crc32(inflected.encode("utf8")) % PARTITION_COUNT
 
-def group_verb_lemmas(lemmas, lemmasByInflected):
-    # group verb lemmas by inflected forms
-    # lemmasByInflected/return: {inflected: {(conjugation, lemma), ...}, ...}
+def process_shard(shard):
+    # the map step: generate the inflected forms of the lemmas in a shard
+    # shard: (shard_number, is_verb, lemmas); see get_shards()
+    # return: (shard_number, number_of_lemmas, partitions); partitions is a
+    # tuple of PARTITION_COUNT sets of (inflected, declension/conjugation,
+    # lemma)
 
-    # lemma forms
-    for lemma in lemmas:
-        for conj in get_conjugations(lemma):
-            lemmasByInflected.setdefault(lemma, set()).add((conj, lemma))
+    (shardNo, isVerb, lemmas) = shard
+    partitions = tuple(set() for i in range(PARTITION_COUNT))
+    generate = generate_verb_forms if isVerb else generate_noun_forms
+    for record in generate(lemmas):
+        partitions[get_partition(record[0])].add(record)
+    return (shardNo, len(lemmas), partitions)
 
-    # inflected forms
-    for form in ALL_VERB_FORMS:
-        # (mood, tense, voice, number, person)
+def reduce_partition(recordSets):
+    # the reduce step: group the lemmas in one partition by inflected forms
+    # and delete inflected forms with just one lemma
+    # recordSets: sets of (inflected, declension/conjugation, lemma)
+    # return: {inflected: {(declension/conjugation, lemma), ...}, ...}
+
+    lemmasByInflected = {}
+    for (inflected, conj, lemma) in itertools.chain.from_iterable(recordSets):
+        lemmasByInflected.setdefault(inflected, set()).add((conj, lemma))
+    return dict(
+        (i, lemmasByInflected[i]) for i in lemmasByInflected
+        if len(lemmasByInflected[i]) > 1
+    )
+
+def generate_shard_results(shards, mapUnordered):
+    # run the map step using the specified map function; report progress
+    # generate: partitions from process_shard()
+
+    shards = list(shards)
+    for (i, (shardNo, lemmaCount, partitions)) in enumerate(
+        mapUnordered(process_shard, shards)
+    ):
         status_msg(
-            "Generating forms: " + "-".join(VERB_ITEM_NAMES[i] for i in form)
-            + "..."
+            f"Shard {shardNo+1}/{len(shards)} done ({lemmaCount} lemmas, "
+            f"{sum(len(p) for p in partitions)} inflected forms); "
+            f"{i+1}/{len(shards)} finished"
         )
-        for lemma in lemmas:
-            for conj in get_conjugations(lemma):
-                consGrad = get_verb_cons_grad(lemma, conj)
-                for inflected in (
-                    conjugate_verb_specific(lemma, conj, consGrad, *form)
-                ):
-                    lemmasByInflected.setdefault(inflected, set()).add(
-                        (conj, lemma)
-                    )
+        yield partitions
+
+def find_homonyms(shards, mapUnordered, mapOrdered):
+    # run the map and reduce steps in memory using the specified map functions
+    # return: {inflected: {(declension/conjugation, lemma), ...}, ...}
+
+    partitions = tuple([] for i in range(PARTITION_COUNT))
+    for shardPartitions in generate_shard_results(shards, mapUnordered):
+        for (p, records) in enumerate(shardPartitions):
+            partitions[p].append(records)
 
+    lemmasByInflected = {}
+    for homonyms in mapOrdered(reduce_partition, partitions):
+        lemmasByInflected.update(homonyms)
     return lemmasByInflected
 
-def delete_non_homonyms(lemmasByInflected):
-    # delete inflected forms with just one lemma
-    return dict(
-        (l, lemmasByInflected[l]) for l in lemmasByInflected
-        if len(lemmasByInflected[l]) > 1
-    )
+def write_run(records, filename):
+    # sort records (inflected, declension/conjugation, lemma) and write them to
+    # a file, one per line; the tab sorts before any letter, so the lines are
+    # sorted by inflected form first
+    with open(filename, "wt", encoding="utf8") as handle:
+        handle.writelines(sorted(
+            f"{inflected}\t{conj}\t{lemma}\n"
+            for (inflected, conj, lemma) in records
+        ))
+
+def merge_runs(filenames):
+    # the reduce step in external sort mode: merge sorted files created by
+    # write_run()
+    # return: {inflected: {(declension/conjugation, lemma), ...}, ...}
 
-def main():
     lemmasByInflected = {}
+    with contextlib.ExitStack() as stack:
+        handles = [
+            stack.enter_context(open(f, "rt", encoding="utf8"))
+            for f in filenames
+        ]
+        for (inflected, lines) in itertools.groupby(
+            heapq.merge(*handles), key=lambda l: l.split("\t", 1)[0]
+        ):
+            lemmas = set()
+            for line in lines:
+                (conj, lemma) = line.rstrip("\n").split("\t")[1:]
+                lemmas.add((int(conj, 10), lemma))
+            if len(lemmas) > 1:
+                lemmasByInflected[inflected] = lemmas
+    return lemmasByInflected
+
+def find_homonyms_external(shards, mapUnordered, runSize):
+    # run the map step using the specified map function, keeping at most
+    # runSize records in memory at a time; the records are written to sorted
+    # temporary files which are then merged
+    # return: {inflected: {(declension/conjugation, lemma), ...}, ...}
 
-    lemmas = set(get_lemmas("generated-lists/nouns.csv"))
-    status_msg(f"Noun lemmas: {len(lemmas)}")
-    lemmasByInflected = group_noun_lemmas(lemmas, lemmasByInflected)
-    status_msg(f"Inflected forms: {len(lemmasByInflected)}")
+    with tempfile.TemporaryDirectory() as directory:
+        filenames = []
+        records = []
+        for partitions in generate_shard_results(shards, mapUnordered):
+            for record in itertools.chain.from_iterable(partitions):
+                records.append(record)
+                if len(records) >= runSize:
+                    filenames.append(
+                        os.path.join(directory, f"run{len(filenames)}.txt")
+                    )
+                    write_run(records, filenames[-1])
+                    records = []
+        if records:
+            filenames.append(
+                os.path.join(directory, f"run{len(filenames)}.txt")
+            )
+            write_run(records, filenames[-1])
+        del records
+
+        status_msg(f"Merging {len(filenames)} sorted file(s)...")
+        return merge_runs(filenames)
+
+def get_arguments():
+    # parse command line arguments
+    # return: (number_of_processes, memory_budget_in_megabytes or None)
+
+    try:
+        args = [int(a, 10) for a in sys.argv[1:]]
+        if len(args) > 2 or min(args, default=1) < 1:
+            raise ValueError
+    except ValueError:
+        sys.exit(
+            "Find partially homonymous inflected nouns and verbs. Optional "
+            "arguments: JOBS [MEGABYTES]. JOBS: number of processes to use "
+            "(default: number of CPUs). MEGABYTES: approximate limit for the "
+            "inflected forms kept in memory; if given, they are sorted in "
+            "temporary files instead. Needs files created by extract.sh."
+        )
+    jobs = args[0] if args else os.cpu_count() or 1
+    return (jobs, args[1] if len(args) > 1 else None)
+
+def main():
+    (jobs, megabytes) = get_arguments()
 
-    lemmas = set(get_lemmas("generated-lists/verbs.csv"))
-    status_msg(f"Verb lemmas: {len(lemmas)}")
-    lemmasByInflected = group_verb_lemmas(lemmas, lemmasByInflected)
-    status_msg(f"Inflected forms: {len(lemmasByInflected)}")
+    nounLemmas = get_lemmas("generated-lists/nouns.csv")
+    status_msg(f"Noun lemmas: {len(nounLemmas)}")
+    verbLemmas = get_lemmas("generated-lists/verbs.csv")
+    status_msg(f"Verb lemmas: {len(verbLemmas)}")
+    shards = get_shards(nounLemmas, verbLemmas)
 
-    lemmasByInflected = delete_non_homonyms(lemmasByInflected)
+    status_msg(f"Generating inflected forms using {jobs} process(es)...")
+    with contextlib.ExitStack() as stack:
+        if jobs == 1:
+            (mapUnordered, mapOrdered) = (map, map)
+        else:
+            pool = stack.enter_context(multiprocessing.Pool(jobs))
+            (mapUnordered, mapOrdered) = (pool.imap_unordered, pool.imap)
+        if megabytes is None:
+            lemmasByInflected = find_homonyms(shards, mapUnordered, mapOrdered)
+        else:
+            lemmasByInflected = find_homonyms_external(
+                shards, mapUnordered, megabytes * 2 ** 20 // BYTES_PER_RECORD
+            )
     status_msg(f"Homonymous inflected forms: {len(lemmasByInflected)}")
 
     print(f"Automatically generated with '{sys.argv[0]}'.")
@@ -116,4 +259,5 @@ def main():
 
         print(f"{allDeclensionsStr:14} {inflected:19} ({lemmasStr})")
 
-main()
+if __name__ == "__main__":
+    main()
@@ -3,42 +3,71 @@ from noundecl import get_declensions
 from verbconj import get_conjugations
 from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
 from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
-from decline_noun import decline_noun_specific, CASES, NUMBERS
-from conjugate_verb import conjugate_verb_specific, ALL_FORMS, ITEM_NAMES
+from decline_noun import decline_noun_paradigm_specific
+from conjugate_verb import conjugate_verb_paradigm_specific
+
+# how much shorter/longer than the lemma an inflected form can be, in letters:
+# (least, most); the range seen in all words in nouns.csv/verbs.csv widened by
+# 2 letters at both ends (the ending changes, consonant gradation and endings
+# only change a few letters at the end of the word); checked by
+# test-inflected_by_length.py
+NOUN_LENGTH_CHANGE = (-2, 8)
+VERB_LENGTH_CHANGE = (-4, 8)
 
 def get_lemmas(filename):
-    # generate lemmas (uninflected forms)
+    # read lemmas (uninflected forms) and their declensions/conjugations from
+    # a CSV file
+    # return: {lemma: tuple of declensions/conjugations, ...}; the tuple is
+    # empty if the file has none for the lemma
+    lemmas = {}
     with open(filename, "rt", encoding="utf8") as handle:
         handle.seek(0)
-        yield from (l.split(",")[0] for l in handle)
-
-def get_nouns(lemmas):
-    # generate inflected forms of noun lemmas
+        for line in handle:
+            fields = line.rstrip("\n").split(",")
+            lemmas.setdefault(fields[0], set()).update(
+                int(c, 10) for c in fields[1:] if c
+            )
+    return dict((l, tuple(sorted(c))) for (l, c) in lemmas.items())
 
-    forms = tuple(
-        (c, n) for c in CASES for n in NUMBERS
-        if not (c == "ins" and n == "sg")
-    )
+def can_have_length(lemma, lengthChange, minLen, maxLen):
+    # can an inflected form of the lemma be minLen-maxLen letters long?
+    return len(lemma) + lengthChange[0] <= maxLen \
+    and len(lemma) + lengthChange[1] >= minLen
 
-    for form in forms:
-        # (case, number)
-        for lemma in lemmas:
-            for decl in get_declensions(lemma):
-                consGrad = get_noun_cons_grad(lemma, decl)
-                yield from decline_noun_specific(lemma, decl, consGrad, *form)
+def get_nouns(lemmas, minLen, maxLen):
+    # generate inflected forms of noun lemmas, one lemma at a time; skip
+    # lemmas without forms of minLen-maxLen letters (other forms are still
+    # generated)
+    # lemmas: {lemma: declensions, ...}; the declensions are only detected
+    # if there are none
 
-def get_verbs(lemmas):
-    # generate inflected forms of verb lemmas
+    for (lemma, decls) in lemmas.items():
+        if not can_have_length(lemma, NOUN_LENGTH_CHANGE, minLen, maxLen):
+            continue
+        for decl in decls or get_declensions(lemma):
+            consGrad = get_noun_cons_grad(lemma, decl)
+            for forms in decline_noun_paradigm_specific(
+                lemma, decl, consGrad
+            ).values():
+                yield from forms
 
-    yield from lemmas
+def get_verbs(lemmas, minLen, maxLen):
+    # generate lemmas and inflected forms of verb lemmas, one lemma at a time;
+    # skip lemmas without forms of minLen-maxLen letters (other forms are
+    # still generated)
+    # lemmas: {lemma: conjugations, ...}; the conjugations are only detected
+    # if there are none
 
-    for form in ALL_FORMS:
-        # (mood, tense, voice, number, person)
-        for lemma in lemmas:
-            for conj in get_conjugations(lemma):
-                consGrad = get_verb_cons_grad(lemma, conj)
-                yield \
-                from conjugate_verb_specific(lemma, conj, consGrad, *form)
+    for (lemma, conjs) in lemmas.items():
+        if not can_have_length(lemma, VERB_LENGTH_CHANGE, minLen, maxLen):
+            continue
+        yield lemma
+        for conj in conjs or get_conjugations(lemma):
+            consGrad = get_verb_cons_grad(lemma, conj)
+            for forms in conjugate_verb_paradigm_specific(
+                lemma, conj, consGrad
+            ).values():
+                yield from forms
 
 def main():
     if len(sys.argv) != 3:
@@ -48,14 +77,15 @@ def main():
         )
     (minLen, maxLen) = (int(a) for a in sys.argv[1:])
 
-    lemmas = set(get_lemmas("generated-lists/nouns.csv"))
-    for word in get_nouns(lemmas):
+    lemmas = get_lemmas("generated-lists/nouns.csv")
+    for word in get_nouns(lemmas, minLen, maxLen):
         if minLen <= len(word) <= maxLen:
             print(word)
 
-    lemmas = set(get_lemmas("generated-lists/verbs.csv"))
-    for word in get_verbs(lemmas):
+    lemmas = get_lemmas("generated-lists/verbs.csv")
+    for word in get_verbs(lemmas, minLen, maxLen):
         if minLen <= len(word) <= maxLen:
             print(word)
 
-main()
+if __name__ == "__main__":
+    main()
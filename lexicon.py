@@ -0,0 +1,307 @@
+"""A full-form lexicon of Finnish nouns and verbs in a compact binary file that
+is read via mmap (no parsing at startup; processes share it through the page
+cache)."""
+
+import array, hashlib, mmap, os, struct, sys
+
+LEXICON_FILE = "generated-lists/lexicon.bin"
+
+# File format (all integers are unsigned 32-bit little-endian):
+#   - header: magic, version, number of forms, number of records (analyses),
+#     number of lemmas, number of form names, size of form blob, size of lemma
+#     blob, SHA-256 hash of the modules that generated the forms (32 bytes;
+#     see get_source_hash())
+#   - form offsets:      (number of forms + 1) integers into the form blob
+#   - record starts:     (number of forms + 1) integers into the records
+#   - records:           two integers per record: lemma number and
+#                        form name number << 8 | declension/conjugation
+#   - lemma offsets:     (number of lemmas + 1) integers into the lemma blob
+#   - form name offsets: (number of form names + 1) integers into the form name
+#                        blob
+#   - form blob:         the distinct inflected forms in UTF-8, sorted
+#                        bytewise (= by Unicode code point), without separators
+#   - lemma blob:        the lemmas in UTF-8, without separators
+#   - form name blob:    the form names (e.g. "gen-pl") in ASCII, without
+#                        separators
+# The records of each form are in consecutive order.
+_MAGIC = b"FMLX"
+_VERSION = 2
+_HEADER = struct.Struct("<4s7I32s")
+
+# modules that generate the inflected forms and their analyses
+_SOURCE_MODULES = (
+    "analyze_word", "decline_noun", "conjugate_verb", "noun_consgrad",
+    "verb_consgrad", "noundecl", "verbconj", "countsyll", "ruleautomaton",
+    "lexicon",
+)
+
+def get_source_hash():
+    """Get a hash that changes when the modules that generate the inflected
+    forms change.
+    return: 32 bytes"""
+
+    hasher = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for module in _SOURCE_MODULES:
+        with open(os.path.join(directory, module + ".py"), "rb") as handle:
+            hasher.update(handle.read())
+    return hasher.digest()
+
+def _to_bytes(integers):
+    # convert integers to unsigned 32-bit little-endian bytes
+    arr = array.array("I", integers)
+    assert arr.itemsize == 4
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+def _join_strings(strings):
+    # return (offsets, blob)
+    offsets = [0]
+    blob = bytearray()
+    for s in strings:
+        blob.extend(s.encode("utf8"))
+        offsets.append(len(blob))
+    return (offsets, bytes(blob))
+
+def write_lexicon(filename, analyses):
+    """Write a lexicon file. The file is replaced atomically, so processes
+    that are reading the old one can continue to do so.
+    filename: the file to write
+    analyses: iterable of (inflected, lemma, declension/conjugation, form
+              name), e.g. from analyze_word.generate_analyses()
+    return:   (number of forms, number of records)"""
+
+    lemmas = []
+    formNames = []
+    lemmaNumbers = {}
+    formNumbers = {}
+    recordsByForm = {}  # {inflected: {(lemma_number, form_conj), ...}, ...}
+
+    for (inflected, lemma, conj, formName) in analyses:
+        if lemma not in lemmaNumbers:
+            lemmaNumbers[lemma] = len(lemmas)
+            lemmas.append(lemma)
+        if formName not in formNumbers:
+            formNumbers[formName] = len(formNames)
+            formNames.append(formName)
+        recordsByForm.setdefault(inflected, set()).add(
+            (lemmaNumbers[lemma], formNumbers[formName] << 8 | conj)
+        )
+
+    forms = sorted(recordsByForm)
+    (formOffsets, formBlob) = _join_strings(forms)
+    (lemmaOffsets, lemmaBlob) = _join_strings(lemmas)
+    (formNameOffsets, formNameBlob) = _join_strings(formNames)
+
+    recordStarts = [0]
+    records = []
+    for inflected in forms:
+        for record in sorted(recordsByForm[inflected]):
+            records.extend(record)
+        recordStarts.append(len(records) // 2)
+
+    tempFilename = filename + ".tmp"
+    with open(tempFilename, "wb") as handle:
+        handle.write(_HEADER.pack(
+            _MAGIC, _VERSION, len(forms), len(records) // 2, len(lemmas),
+            len(formNames), len(formBlob), len(lemmaBlob), get_source_hash()
+        ))
+        for integers in (
+            formOffsets, recordStarts, records, lemmaOffsets, formNameOffsets
+        ):
+            handle.write(_to_bytes(integers))
+        for blob in (formBlob, lemmaBlob, formNameBlob):
+            handle.write(blob)
+    os.replace(tempFilename, filename)
+
+    return (len(forms), len(records) // 2)
+
+class Lexicon:
+    """Read a lexicon file created by write_lexicon(). Lookups are binary
+    searches in the memory-mapped file. Usable as a context manager.
+    sourceHash: get_source_hash() when the file was written"""
+
+    def __init__(self, filename=LEXICON_FILE):
+        """Raise ValueError if the file is not a lexicon file of this version
+        or is truncated."""
+
+        (self._view, self._mmap) = (None, None)
+        self._handle = open(filename, "rb")
+        try:
+            # ValueError if the file is empty
+            self._mmap = mmap.mmap(
+                self._handle.fileno(), 0, access=mmap.ACCESS_READ
+            )
+            try:
+                (
+                    magic, version, self._formCount, recordCount, lemmaCount,
+                    formNameCount, formBlobSize, lemmaBlobSize,
+                    self.sourceHash
+                ) = _HEADER.unpack_from(self._mmap, 0)
+                if magic != _MAGIC or version != _VERSION:
+                    raise ValueError(
+                        f"not a lexicon file (version {_VERSION})"
+                    )
+                # check the size before any views of the file are created;
+                # the last form name offset is the size of the form name blob
+                pos = _HEADER.size + 4 * (
+                    (self._formCount + 1) * 2 + recordCount * 2
+                    + lemmaCount + 1 + formNameCount
+                )
+                (formNameBlobSize,) = struct.unpack_from("<I", self._mmap, pos)
+            except struct.error:
+                raise ValueError("truncated or corrupt lexicon file")
+            if len(self._mmap) != pos + 4 + formBlobSize + lemmaBlobSize \
+            + formNameBlobSize:
+                raise ValueError("truncated or corrupt lexicon file")
+        except BaseException:
+            self.close()
+            raise
+
+        self._view = memoryview(self._mmap)
+        pos = _HEADER.size
+        arrays = []
+        for count in (
+            self._formCount + 1, self._formCount + 1, recordCount * 2,
+            lemmaCount + 1, formNameCount + 1
+        ):
+            arrays.append(self._get_integers(pos, count))
+            pos += count * 4
+        (
+            self._formOffsets, self._recordStarts, self._records,
+            self._lemmaOffsets, self._formNameOffsets
+        ) = arrays
+
+        self._formBlobStart = pos
+        self._lemmaBlobStart = pos + formBlobSize
+        self._formNameBlobStart = self._lemmaBlobStart + lemmaBlobSize
+
+    def _get_integers(self, pos, count):
+        # get unsigned 32-bit little-endian integers from the file without
+        # copying them (except on big-endian machines)
+        view = self._view[pos:pos+count*4]
+        if sys.byteorder == "little":
+            return view.cast("I")
+        arr = array.array("I", view.tobytes())
+        arr.byteswap()
+        return arr
+
+    def close(self):
+        if self._view is not None:
+            for arr in (
+                self._formOffsets, self._recordStarts, self._records,
+                self._lemmaOffsets, self._formNameOffsets
+            ):
+                if isinstance(arr, memoryview):
+                    arr.release()
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        # number of distinct inflected forms
+        return self._formCount
+
+    def _get_form(self, index):
+        # get an inflected form as bytes
+        start = self._formBlobStart
+        return self._mmap[
+            start+self._formOffsets[index]:start+self._formOffsets[index+1]
+        ]
+
+    def _get_string(self, blobStart, offsets, index):
+        return self._mmap[
+            blobStart+offsets[index]:blobStart+offsets[index+1]
+        ].decode("utf8")
+
+    def _find(self, key):
+        # return the index of the first form that is >= key (bytes)
+        (lo, hi) = (0, self._formCount)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get_form(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _get_analyses(self, index):
+        # get the analyses of a form as a sorted tuple
+        analyses = []
+        for r in range(self._recordStarts[index], self._recordStarts[index+1]):
+            (lemmaNumber, formConj) = self._records[r*2:r*2+2]
+            analyses.append((
+                self._get_string(
+                    self._lemmaBlobStart, self._lemmaOffsets, lemmaNumber
+                ),
+                formConj & 0xff,
+                self._get_string(
+                    self._formNameBlobStart, self._formNameOffsets,
+                    formConj >> 8
+                ),
+            ))
+        return tuple(sorted(analyses))
+
+    def analyze(self, word):
+        """word:   an inflected noun or verb, e.g. "kuusien"
+        return: a sorted tuple of (lemma, declension/conjugation, form name),
+                e.g. (("kuusi", 24, "gen-pl"), ("kuusi", 27, "gen-pl")); empty
+                if the word was not found"""
+
+        key = word.encode("utf8")
+        index = self._find(key)
+        if index < self._formCount and self._get_form(index) == key:
+            return self._get_analyses(index)
+        return ()
+
+    def analyze_prefix(self, prefix):
+        """prefix:   the beginning of inflected forms, e.g. "kuusi"
+        generate: (inflected, analyses) for each inflected form that begins
+                  with the prefix, in sorted order; see analyze()"""
+
+        key = prefix.encode("utf8")
+        index = self._find(key)
+        while index < self._formCount:
+            form = self._get_form(index)
+            if not form.startswith(key):
+                break
+            yield (form.decode("utf8"), self._get_analyses(index))
+            index += 1
+
+def main():
+    if len(sys.argv) == 1:
+        from analyze_word import generate_analyses
+        print("Generating inflected forms...", file=sys.stderr)
+        (formCount, recordCount) = write_lexicon(
+            LEXICON_FILE, generate_analyses()
+        )
+        print(
+            f"Wrote {LEXICON_FILE} ({formCount} forms, {recordCount} "
+            "analyses).",
+            file=sys.stderr
+        )
+    elif len(sys.argv) == 2:
+        with Lexicon() as lexicon:
+            for (inflected, analyses) in lexicon.analyze_prefix(sys.argv[1]):
+                for (lemma, conj, formName) in analyses:
+                    print(f"{inflected},{lemma},{conj},{formName}")
+    else:
+        sys.exit(
+            "Without arguments: write all inflected forms of the words in "
+            "generated-lists/nouns.csv and verbs.csv to "
+            f"{LEXICON_FILE}. With one argument (a prefix): print CSV lines "
+            "word,lemma,declension/conjugation,form for all inflected forms "
+            "in the lexicon that begin with the prefix."
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Measure the latency of morphserver.py or morphasync.py under a synthetic
+load from many concurrent connections on the same machine."""
+
+# Each connection sends one request at a time and waits for the response. The
+# requests decline nouns and conjugate verbs from nouns.csv and verbs.csv and
+# split compounds from compounds.txt; HOT_SHARE of the declension and
+# conjugation requests are for the HOT_COUNT "hot" nouns and verbs, the rest
+# are for random words.
+
+import asyncio, json, random, statistics, sys, time
+
+DEFAULT_PORT = 8651
+NOUN_FILE = "generated-lists/nouns.csv"
+VERB_FILE = "generated-lists/verbs.csv"
+COMPOUND_FILE = "compounds.txt"
+HOT_COUNT = 20
+HOT_SHARE = 0.8
+SPLIT_SHARE = 0.1  # share of split requests
+
+def read_lines(filename):
+    with open(filename, "rt", encoding="utf8") as handle:
+        handle.seek(0)
+        yield from (l.rstrip("\n") for l in handle)
+
+def get_requests(count, rand):
+    # generate synthetic requests (dicts)
+
+    nouns = [l.split(",")[0] for l in read_lines(NOUN_FILE)]
+    verbs = [l.split(",")[0] for l in read_lines(VERB_FILE)]
+    compounds = [l.replace("_", "") for l in read_lines(COMPOUND_FILE)]
+    hotNouns = rand.sample(nouns, HOT_COUNT)
+    hotVerbs = rand.sample(verbs, HOT_COUNT)
+
+    for i in range(count):
+        if rand.random() < SPLIT_SHARE:
+            (op, words) = ("split", compounds)
+        else:
+            (op, words, hotWords) = rand.choice((
+                ("decline", nouns, hotNouns), ("conjugate", verbs, hotVerbs)
+            ))
+            if rand.random() < HOT_SHARE:
+                words = hotWords
+        yield {"op": op, "word": rand.choice(words), "id": i}
+
+async def run_connection(address, requests, latencies):
+    # send the requests one at a time over one connection; append the latency
+    # of each to latencies; return the number of errors
+
+    if isinstance(address, int):
+        (reader, writer) = await asyncio.open_connection(
+            "127.0.0.1", address, limit=2 ** 24
+        )
+    else:
+        (reader, writer) = await asyncio.open_unix_connection(
+            address, limit=2 ** 24
+        )
+
+    errorCnt = 0
+    for request in requests:
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode("utf8") + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if "error" in response or response.get("id") != request["id"]:
+            errorCnt += 1
+
+    writer.close()
+    await writer.wait_closed()
+    return errorCnt
+
+async def run_load(address, connCnt, requestCnt):
+    # return (latencies, number of errors, duration)
+
+    rand = random.Random(1)
+    requests = list(get_requests(connCnt * requestCnt, rand))
+    latencies = []
+    start = time.perf_counter()
+    errorCnts = await asyncio.gather(*(
+        run_connection(
+            address, requests[i*requestCnt:(i+1)*requestCnt], latencies
+        ) for i in range(connCnt)
+    ))
+    return (latencies, sum(errorCnts), time.perf_counter() - start)
+
+def main():
+    try:
+        args = [int(a, 10) if a.isdigit() else a for a in sys.argv[1:]]
+        (address, connCnt, requestCnt) = args + [DEFAULT_PORT, 50, 100][
+            len(args):
+        ]
+        if len(args) > 3 or not isinstance(connCnt, int) \
+        or not isinstance(requestCnt, int) or min(connCnt, requestCnt) < 1:
+            raise ValueError
+    except ValueError:
+        sys.exit(
+            "Measure the latency of morphserver.py or morphasync.py. Optional "
+            "arguments: [ADDRESS [CONNECTIONS [REQUESTS]]]. ADDRESS: port on "
+            f"127.0.0.1 (default: {DEFAULT_PORT}) or path of a Unix socket. "
+            "CONNECTIONS: number of concurrent connections (default: 50). "
+            "REQUESTS: requests per connection (default: 100). Needs "
+            f"{NOUN_FILE}, {VERB_FILE} and {COMPOUND_FILE}."
+        )
+
+    (latencies, errorCnt, duration) = asyncio.run(
+        run_load(address, connCnt, requestCnt)
+    )
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"Requests:   {len(latencies)} ({connCnt} connections)")
+    print(f"Errors:     {errorCnt}")
+    print(f"Throughput: {len(latencies) / duration:.0f} requests/s")
+    print(
+        f"Latency:    p50 {percentiles[49] * 1000:.2f} ms, "
+        f"p99 {percentiles[98] * 1000:.2f} ms"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""An asyncio server with the same protocol and operations as morphserver.py,
+for many concurrent clients that often ask for the same words."""
+
+# Identical requests (ignoring "id") that are in progress at the same time are
+# computed only once. Requests that arrive within BATCH_WINDOW of each other
+# are sent to a pool of worker processes together, so the event loop only
+# parses and serializes JSON. Each connection gets its responses in the order
+# of its requests; when MAX_PENDING lines of a connection await their
+# responses, the connection is not read until the oldest one has been sent
+# (back-pressure), so a fast client can't make the server queue unlimited
+# work.
+
+import asyncio, concurrent.futures, functools, json, os, signal, stat, sys
+import classcache, morphserver, paradigmcache, splitcomp
+
+DEFAULT_PORT = 8651
+BATCH_WINDOW = 0.002  # seconds to wait for more requests before dispatching
+BATCH_SIZE = 50       # dispatch at once when this many requests are waiting
+MAX_PENDING = 64      # lines per connection that may await their responses
+LINE_LIMIT = 2 ** 24  # maximum length of a line (a batch) in bytes
+
+def _handle_batch(requests):
+    # run in a worker process; see morphserver.handle_request()
+    return [morphserver.handle_request(r) for r in requests]
+
+class Dispatcher:
+    """Coalesce and batch requests and compute them in a process pool."""
+
+    def __init__(self, create_pool):
+        """create_pool: a function that returns a new process pool (called
+                     again if the pool breaks, e.g. a worker is killed)"""
+        self._create_pool = create_pool
+        self._pool = create_pool()
+        self._inFlight = {}  # {key: future of the response, ...}
+        self._waiting = []   # [(key, request), ...] not dispatched yet
+        self._timer = None   # dispatches _waiting after BATCH_WINDOW
+        self._tasks = set()  # running batches
+        # statistics
+        self.requestCnt = 0
+        self.computedCnt = 0
+        self.batchCnt = 0
+        self.restartCnt = 0
+
+    def close(self):
+        """Shut down the process pool."""
+        self._pool.shutdown()
+
+    async def handle_request(self, request):
+        """request: see morphserver.handle_request()
+        return:  the response (a dict)"""
+
+        self.requestCnt += 1
+        if not isinstance(request, dict):
+            return morphserver.handle_request(request)
+
+        # the same request with another "id" has the same result
+        request = request.copy()
+        hasId = "id" in request
+        requestId = request.pop("id", None)
+        key = json.dumps(request, sort_keys=True)
+
+        future = self._inFlight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inFlight[key] = future
+            self._waiting.append((key, request))
+            if len(self._waiting) >= BATCH_SIZE:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    BATCH_WINDOW, self._dispatch
+                )
+
+        # the future is shared by all requesters; if one of them is cancelled
+        # (its client disconnected), the others still get the response
+        response = await asyncio.shield(future)
+        if hasId:
+            response = dict(id=requestId, **response)
+        return response
+
+    def _dispatch(self):
+        # send the waiting requests to the pool as one batch
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        (batch, self._waiting) = (self._waiting, [])
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        self.batchCnt += 1
+        self.computedCnt += len(batch)
+        pool = self._pool
+        try:
+            responses = await asyncio.get_running_loop().run_in_executor(
+                pool, _handle_batch, [r for (k, r) in batch]
+            )
+        except Exception as e:
+            # e.g. a worker process was killed
+            responses = [{"error": f"internal error: {e!r}"}] * len(batch)
+            if isinstance(e, concurrent.futures.BrokenExecutor) \
+            and pool is self._pool:
+                # a broken pool fails all later batches too; replace it
+                # (unless another batch already has)
+                pool.shutdown(wait=False)
+                self._pool = self._create_pool()
+                self.restartCnt += 1
+        for ((key, request), response) in zip(batch, responses):
+            self._inFlight.pop(key).set_result(response)
+
+async def _handle_line(dispatcher, line):
+    # handle a request or a batch of requests; return the response line (see
+    # morphserver.handle_line())
+    try:
+        request = json.loads(line)
+    except ValueError:
+        response = {"error": "invalid JSON"}
+    else:
+        if isinstance(request, list):
+            response = await asyncio.gather(
+                *(dispatcher.handle_request(r) for r in request)
+            )
+        else:
+            response = await dispatcher.handle_request(request)
+    return json.dumps(
+        response, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf8") + b"\n"
+
+async def _handle_connection(dispatcher, reader, writer):
+    # start handling each line as soon as it has been read, but write the
+    # responses in the order of the lines
+    pending = asyncio.Queue(MAX_PENDING)  # tasks of lines; None = end
+
+    async def write_responses():
+        while (task := await pending.get()) is not None:
+            response = await task
+            if not writer.is_closing():
+                writer.write(response)
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    # keep emptying the queue so the reader doesn't block
+                    writer.close()
+
+    writerTask = asyncio.ensure_future(write_responses())
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                # waits if the queue is full
+                await pending.put(
+                    asyncio.ensure_future(_handle_line(dispatcher, line))
+                )
+    except (ConnectionError, ValueError):
+        # ValueError: a line longer than LINE_LIMIT
+        pass
+    await pending.put(None)
+    await writerTask
+    writer.close()
+
+def _remove_socket(path):
+    # remove a Unix socket file, but not a file of any other type
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+
+async def serve(address, jobs, cacheSize=None):
+    """Run the server until cancelled; print statistics to stderr at exit.
+    address:   a port number on the loopback interface (int) or the path of a
+               Unix socket (str; an old socket file is replaced)
+    jobs:      number of worker processes
+    cacheSize: number of paradigms each worker process keeps in paradigmcache
+               (None = no cache)"""
+
+    # load the compound splitter's word lists and the saved classifications
+    # before the worker processes are forked, so they share them
+    splitcomp.load_word_lists()
+    classcache.load(memoize=False)
+
+    # each worker process has its own paradigm cache
+    (initializer, initargs) = (None, ())
+    if cacheSize is not None:
+        (initializer, initargs) = (paradigmcache.enable, (cacheSize,))
+
+    dispatcher = Dispatcher(functools.partial(
+        concurrent.futures.ProcessPoolExecutor, jobs,
+        initializer=initializer, initargs=initargs
+    ))
+    try:
+        handler = functools.partial(_handle_connection, dispatcher)
+        if isinstance(address, int):
+            server = await asyncio.start_server(
+                handler, "127.0.0.1", address, limit=LINE_LIMIT
+            )
+        else:
+            _remove_socket(address)
+            server = await asyncio.start_unix_server(
+                handler, address, limit=LINE_LIMIT
+            )
+        print(f"Listening on {address}.", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            print(
+                f"Requests: {dispatcher.requestCnt}, computed: "
+                f"{dispatcher.computedCnt}, batches: {dispatcher.batchCnt}, "
+                f"pool restarts: {dispatcher.restartCnt}.",
+                file=sys.stderr
+            )
+            # the socket this server created
+            if not isinstance(address, int):
+                _remove_socket(address)
+    finally:
+        dispatcher.close()
+
+def get_arguments():
+    # parse command line arguments; return (address, jobs, paradigm cache
+    # size or None)
+
+    args = sys.argv[1:]
+    try:
+        jobs = os.cpu_count() or 1
+        cacheSize = None
+        while args[:1] in (["--jobs"], ["--paradigm-cache"]):
+            if args[0] == "--jobs":
+                jobs = int(args[1], 10)
+            else:
+                cacheSize = int(args[1], 10)
+            args = args[2:]
+        if len(args) > 1 or jobs < 1 or cacheSize is not None \
+        and cacheSize < 1:
+            raise ValueError
+    except (ValueError, IndexError):
+        sys.exit(
+            "Answer morphology requests like morphserver.py, coalescing "
+            "identical requests and computing them in a process pool. "
+            "Optional arguments: [--jobs N] [--paradigm-cache M] [ADDRESS]. "
+            "N: number of worker processes (default: number of CPUs). M: "
+            "number of paradigms each worker caches (see paradigmcache.py; "
+            "default: no cache). ADDRESS: port on 127.0.0.1 (default: "
+            f"{DEFAULT_PORT}) or path of a Unix socket."
+        )
+    address = args[0] if args else str(DEFAULT_PORT)
+    return (
+        int(address, 10) if address.isdigit() else address, jobs, cacheSize
+    )
+
+def main():
+    (address, jobs, cacheSize) = get_arguments()
+
+    # on SIGTERM, clean up like on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit())
+    try:
+        asyncio.run(serve(address, jobs, cacheSize))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
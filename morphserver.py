@@ -0,0 +1,233 @@
+"""A server that keeps the morphology modules loaded and answers requests over
+a local socket, so programs don't have to start a Python process per word."""
+
+# Protocol: the client sends requests as lines of JSON (UTF-8) and gets one
+# line of JSON back for each line, in the same order. A request is an object,
+# e.g. {"op": "decline", "word": "kuusi"}; the response is {"result": ...} or
+# {"error": "message"} (with the "id" of the request, if any). A line may also
+# be an array of requests (a batch); the response is then an array of
+# responses. Connections are kept open for any number of requests. See
+# OPERATIONS for the operations.
+
+import json, os, signal, socketserver, stat, sys
+import classcache, conjugate_verb, decline_noun, paradigmcache, splitcomp
+from classify import classify_nouns, classify_verbs
+from countsyll import count_syllables
+
+DEFAULT_PORT = 8650
+
+_NOUN_FORM_NAMES = dict(
+    ((c, n), f"{decline_noun.ITEM_NAMES[c]}-{decline_noun.ITEM_NAMES[n]}")
+    for (c, n) in decline_noun.ALL_FORMS
+)
+_VERB_FORM_NAMES = dict(
+    (f, "-".join(conjugate_verb.ITEM_NAMES[i] for i in f))
+    for f in conjugate_verb.ALL_FORMS
+)
+
+def _get_word(request):
+    # get the "word" of a request
+    word = request.get("word")
+    if not isinstance(word, str) or not word:
+        raise ValueError("'word' must be a non-empty string")
+    return word
+
+def _get_classes(request, first, last):
+    # get the optional "classes" (declensions/conjugations) of a request;
+    # None if not given
+    classes = request.get("classes")
+    if classes is None or classes == []:
+        return None
+    if not isinstance(classes, list) or not all(
+        type(c) is int and first <= c <= last for c in classes
+    ):
+        raise ValueError(
+            f"'classes' must be a list of integers {first}-{last}"
+        )
+    return classes
+
+def _decline(request):
+    # {"word": noun, "classes": optional declensions} -> {form name: sorted
+    # list of inflected forms, ...}; empty if unrecognized
+    paradigm = decline_noun.decline_noun_paradigm(
+        _get_word(request), _get_classes(request, 1, 49)
+    )
+    return dict(
+        (_NOUN_FORM_NAMES[f], sorted(i)) for (f, i) in paradigm.items() if i
+    )
+
+def _conjugate(request):
+    # {"word": verb, "classes": optional conjugations} -> {form name: list of
+    # inflected forms sorted by length, ...}; empty if unrecognized
+    paradigm = conjugate_verb.conjugate_verb_paradigm(
+        _get_word(request), _get_classes(request, 52, 76)
+    )
+    return dict(
+        (_VERB_FORM_NAMES[f], sorted(i, key=lambda v: (len(v), v)))
+        for (f, i) in paradigm.items() if i
+    )
+
+def _classify(request):
+    # {"word": word, "pos": "noun" or "verb"} -> {"classes": declensions/
+    # conjugations, "consGrad": does consonant gradation apply in each,
+    # "syllables": syllable count}
+    classifiers = {"noun": classify_nouns, "verb": classify_verbs}
+    if request.get("pos") not in classifiers:
+        raise ValueError("'pos' must be 'noun' or 'verb'")
+    (word, conjs, consGrads, syllCnt) = next(
+        classifiers[request["pos"]]([_get_word(request)])
+    )
+    return {
+        "classes": list(conjs), "consGrad": list(consGrads),
+        "syllables": syllCnt,
+    }
+
+def _syllables(request):
+    # {"word": word} -> syllable count (1-4; 4 = 4 or more)
+    return count_syllables(_get_word(request))
+
+def _split(request):
+    # {"word": compound} -> list of parts
+    return list(splitcomp.split_compound(_get_word(request)))
+
+# {name: function, ...}; each function takes a request and returns the result
+OPERATIONS = {
+    "decline": _decline,
+    "conjugate": _conjugate,
+    "classify": _classify,
+    "syllables": _syllables,
+    "split": _split,
+}
+
+def handle_request(request):
+    """Handle one request of the protocol (see the start of this file).
+    request: a dict, e.g. {"op": "split", "word": "kuusipuu"}
+    return:  a dict: {"result": ...} or {"error": "message"}, with the "id" of
+             the request, if any"""
+
+    if not isinstance(request, dict):
+        return {"error": "request must be an object"}
+    response = {}
+    if "id" in request:
+        response["id"] = request["id"]
+    operation = OPERATIONS.get(request.get("op"))
+    if operation is None:
+        response["error"] = "'op' must be one of: " + ", ".join(OPERATIONS)
+        return response
+    try:
+        response["result"] = operation(request)
+    except ValueError as e:
+        response["error"] = str(e)
+    except Exception as e:
+        # don't let a bug or an odd word close the connection
+        response["error"] = f"internal error: {e!r}"
+    return response
+
+def handle_line(line):
+    """Handle one line of the protocol: a request or a batch of requests.
+    line:   a line of JSON (bytes or str)
+    return: the response line (bytes, including the newline)"""
+
+    try:
+        request = json.loads(line)
+    except ValueError:
+        response = {"error": "invalid JSON"}
+    else:
+        if isinstance(request, list):
+            response = [handle_request(r) for r in request]
+        else:
+            response = handle_request(request)
+    return json.dumps(
+        response, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf8") + b"\n"
+
+class _Handler(socketserver.StreamRequestHandler):
+    # handle one connection
+    def handle(self):
+        for line in self.rfile:
+            if line.strip():
+                self.wfile.write(handle_line(line))
+
+class _TCPHandler(_Handler):
+    # send each response immediately
+    disable_nagle_algorithm = True
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+def get_server(address):
+    """Create a server (call serve_forever() to run it).
+    address: a port number on the loopback interface (int) or the path of a
+             Unix socket (str; an old socket file is replaced)"""
+
+    if isinstance(address, int):
+        return _TCPServer(("127.0.0.1", address), _TCPHandler)
+    try:
+        if stat.S_ISSOCK(os.stat(address).st_mode):
+            os.remove(address)
+    except FileNotFoundError:
+        pass
+    return _UnixServer(address, _Handler)
+
+def get_arguments():
+    # parse command line arguments; return (address, paradigm cache size or
+    # None)
+
+    args = sys.argv[1:]
+    try:
+        cacheSize = None
+        if args[:1] == ["--paradigm-cache"]:
+            cacheSize = int(args[1], 10)
+            args = args[2:]
+        if len(args) > 1 or cacheSize is not None and cacheSize < 1:
+            raise ValueError
+    except (ValueError, IndexError):
+        sys.exit(
+            "Answer morphology requests (decline, conjugate, classify, "
+            "syllables, split) in JSON lines over a local socket. Optional "
+            "arguments: [--paradigm-cache N] [ADDRESS]. N: number of "
+            "paradigms to cache (see paradigmcache.py; default: no cache). "
+            f"ADDRESS: port on 127.0.0.1 (default: {DEFAULT_PORT}) or path "
+            "of a Unix socket."
+        )
+    address = args[0] if args else str(DEFAULT_PORT)
+    return (int(address, 10) if address.isdigit() else address, cacheSize)
+
+def main():
+    (address, cacheSize) = get_arguments()
+
+    # load the compound splitter's word lists now instead of on the first
+    # request (the other modules are ready after import); use the
+    # classifications of known words if they have been saved
+    splitcomp.load_word_lists()
+    classcache.load(memoize=False)
+    if cacheSize is not None:
+        paradigmcache.enable(maxEntries=cacheSize)
+
+    server = get_server(address)
+    print(f"Listening on {address}.", file=sys.stderr)
+    # on SIGTERM, clean up like on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if not isinstance(address, int):
+            os.remove(address)
+        if paradigmcache.is_enabled():
+            stats = paradigmcache.get_stats()
+            print(
+                f"Paradigm cache: {stats['hits']} hits, {stats['misses']} "
+                f"misses, {stats['evictions']} evictions, {stats['entries']} "
+                "entries.",
+                file=sys.stderr
+            )
+
+if __name__ == "__main__":
+    main()
@@ -5,26 +5,32 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
-def main():
-    if len(sys.argv) != 2:
-        sys.exit(
-            "Print words that only occur as non-final parts of compounds (not "
-            "final). Argument: compoundLisFile"
-        )
-    filename = sys.argv[1]
+def get_nonfinals(compounds):
+    """Get words that only occur as non-final parts of compounds (not final).
+    compounds: an iterable of compounds with parts separated by "_"
+    return:    a set of words"""
 
     # read compounds as tuples
     compounds = {
-        tuple(p.strip("'- ") for p in l.split("_"))
-        for l in read_lines(sys.argv[1])
+        tuple(p.strip("'- ") for p in c.split("_")) for c in compounds
     }
 
     # get non-final parts
     nonFinals = set(itertools.chain.from_iterable(c[:-1] for c in compounds))
     # delete parts that also occur as finals
     nonFinals.difference_update(c[-1] for c in compounds)
+    return nonFinals
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit(
+            "Print words that only occur as non-final parts of compounds (not "
+            "final). Argument: compoundLisFile"
+        )
+    filename = sys.argv[1]
 
-    for word in nonFinals:
+    for word in get_nonfinals(read_lines(filename)):
         print(word)
 
-main()
+if __name__ == "__main__":
+    main()
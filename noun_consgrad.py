@@ -1,6 +1,7 @@
 """Determine whether consonant gradation applies to a Finnish noun."""
 
 import re, sys
+import classcache
 from noundecl import get_declensions, DECLENSION_DESCRIPTIONS
 
 # Exceptions to rules. Notes:
@@ -93,7 +94,18 @@ def get_consonant_gradation(noun, decl, useExceptions=True):
     noun:          str
     decl:          Kotus declension (1-49)
     useExceptions: bool; should be True except for testing purposes
-    return:        does consonant gradation apply? (bool)"""
+    return:        does consonant gradation apply? (bool); from classcache if
+                   enabled"""
+
+    if not useExceptions:
+        return _get_consonant_gradation(noun, decl, False)
+    return classcache.get(
+        "nounConsGrad", (decl, noun), _get_consonant_gradation, noun, decl,
+        True
+    )
+
+def _get_consonant_gradation(noun, decl, useExceptions):
+    # see get_consonant_gradation()
 
     if useExceptions:
         if (decl, noun) in _EXCEPTIONS_NO:
@@ -101,10 +113,10 @@ def get_consonant_gradation(noun, decl, useExceptions=True):
         if (decl, noun) in _EXCEPTIONS_YES:
             return True
 
-    if decl not in _RULES:
-        return False
-
-    return re.search(_RULES[decl], noun) is not None
+    # call the compiled regex directly; re.search() would look it up in the
+    # cache of the re module first
+    regex = _RULES.get(decl)
+    return regex is not None and regex.search(noun) is not None
 
 def _get_redundant_exceptions():
     # generate words that are unnecessarily listed as exceptions
@@ -3,7 +3,9 @@
 # Note: A = a/ä, O = o/ö, U = u/y, V = any vowel, C = any consonant.
 
 import re, sys
+import classcache
 from countsyll import count_syllables
+from ruleautomaton import RuleAutomaton
 
 # A typical noun in each declension.
 # Forms: nominative sg, genitive sg, genitive pl, partitive sg, partitive pl,
@@ -682,23 +684,42 @@ _EXCEPTIONS_4SYLL = {
     "stradivarius": 39, "trikomoonas": 39,
 }
 
-def get_declensions(noun, useExceptions=True):
+# the rules compiled into automata that find the first matching rule in one
+# pass over the noun (see ruleautomaton.py; each is built on first use)
+_AUTOMATON_1SYLL = RuleAutomaton(_RULES_1SYLL)
+_AUTOMATON_2SYLL = RuleAutomaton(_RULES_2SYLL)
+_AUTOMATON_3SYLL = RuleAutomaton(_RULES_3SYLL)
+_AUTOMATON_4SYLL = RuleAutomaton(_RULES_4SYLL)
+
+def get_declensions(noun, useExceptions=True, syllCnt=None):
     """Get the Kotus declension(s) of a Finnish noun (including adjectives/
     pronouns/numerals, excluding compounds).
     noun:          the noun in nominative singular
     useExceptions: use True except for testing purposes
-    return:        a tuple of 0-2 declensions (each 1-49)"""
+    syllCnt:       count_syllables() of the noun without leading/trailing
+                   "'- " if already known, otherwise None
+    return:        a tuple of 0-2 declensions (each 1-49); from classcache if
+                   enabled"""
 
     assert isinstance(noun, str)
 
     noun = noun.strip("'- ")
+    if not useExceptions:
+        return _get_declensions(noun, False, syllCnt)
+    return classcache.get(
+        "declensions", noun, _get_declensions, noun, True, syllCnt
+    )
+
+def _get_declensions(noun, useExceptions, syllCnt):
+    # see get_declensions(); noun has been stripped
 
     try:
         return _MULTI_DECLENSION_NOUNS[noun]
     except KeyError:
         pass
 
-    syllCnt = count_syllables(noun)
+    if syllCnt is None:
+        syllCnt = count_syllables(noun)
 
     if useExceptions:
         if syllCnt == 1:
@@ -715,18 +736,16 @@ def get_declensions(noun, useExceptions=True):
             pass
 
     if syllCnt == 1:
-        rules = _RULES_1SYLL
+        automaton = _AUTOMATON_1SYLL
     elif syllCnt == 2:
-        rules = _RULES_2SYLL
+        automaton = _AUTOMATON_2SYLL
     elif syllCnt == 3:
-        rules = _RULES_3SYLL
+        automaton = _AUTOMATON_3SYLL
     else:
-        rules = _RULES_4SYLL
+        automaton = _AUTOMATON_4SYLL
 
-    for (declension, regex) in rules:
-        if regex.search(noun) is not None:
-            return (declension,)
-    return ()
+    declension = automaton.match(noun)
+    return () if declension is None else (declension,)
 
 def _get_redundant_exceptions():
     # generate nouns that are unnecessarily on the exceptions list
@@ -0,0 +1,109 @@
+"""An optional cache of paradigms (all inflected forms of a word in one
+declension/conjugation) for decline_noun.py and conjugate_verb.py. Disabled
+until enable() is called."""
+
+# Real text follows Zipf's law: a few thousand lemmas account for most words,
+# so a long-running program (e.g. morphserver.py) that inflects the same
+# lemmas again and again can keep their paradigms. The cache is keyed on whole
+# paradigms, e.g. ("noun", "kuusi", 27, False), so one entry serves all forms
+# of a lemma; decline_noun_specific() and conjugate_verb_specific() pick one
+# form from it. The least recently used paradigms are evicted when there are
+# more than maxEntries of them or they take more than maxBytes (as estimated
+# by _get_size()). The cache is shared by all threads of the process.
+
+import collections, sys, threading
+
+_cache = None  # an OrderedDict when enabled, the most recently used last
+_maxEntries = None
+_maxBytes = None
+_lock = threading.Lock()
+_stats = collections.Counter()  # hits, misses, evictions, bytes
+
+def _get_size(obj):
+    # estimate the memory used by a paradigm, its key or part of them, in
+    # bytes (the objects shared with other paradigms are counted too)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_get_size(k) + _get_size(v) for (k, v) in obj.items())
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(_get_size(i) for i in obj)
+    return size
+
+def enable(maxEntries=10000, maxBytes=None):
+    """Enable the cache and empty it; reset the statistics.
+    maxEntries: maximum number of paradigms to keep (None = no limit)
+    maxBytes:   maximum estimated size of the paradigms in bytes (None = no
+                limit); a paradigm takes about 8 kB on average"""
+
+    global _cache, _maxEntries, _maxBytes
+
+    with _lock:
+        _cache = collections.OrderedDict()
+        (_maxEntries, _maxBytes) = (maxEntries, maxBytes)
+        _stats.clear()
+
+def disable():
+    """Disable the cache and free the paradigms (the statistics are kept)."""
+
+    global _cache
+
+    with _lock:
+        _cache = None
+        _stats["bytes"] = 0
+
+def is_enabled():
+    return _cache is not None
+
+def get_stats():
+    """return: {"hits": int, "misses": int, "evictions": int, "entries": int,
+            "bytes": estimated size of the paradigms}"""
+
+    with _lock:
+        return {
+            "hits": _stats["hits"],
+            "misses": _stats["misses"],
+            "evictions": _stats["evictions"],
+            "entries": 0 if _cache is None else len(_cache),
+            "bytes": _stats["bytes"],
+        }
+
+def get_paradigm(key, function, *args):
+    """Get a paradigm from the cache or compute and store it.
+    key:      identifies the paradigm, e.g. ("noun", "kuusi", 27, False)
+    function: computes the paradigm (a dict whose values are immutable) from
+              args; called directly if the cache is disabled
+    return:   the paradigm; a new dict each time, so the caller may modify
+              it"""
+
+    if _cache is None:
+        return function(*args)
+
+    with _lock:
+        try:
+            (paradigm, size) = _cache[key]
+        except (KeyError, TypeError):
+            # TypeError: the cache was disabled by another thread
+            paradigm = None
+        else:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+    if paradigm is not None:
+        return dict(paradigm)
+
+    # compute without the lock, so other threads can use the cache meanwhile
+    paradigm = function(*args)
+    size = _get_size(key) + _get_size(paradigm)
+
+    with _lock:
+        _stats["misses"] += 1
+        if _cache is not None and key not in _cache:
+            _cache[key] = (paradigm, size)
+            _stats["bytes"] += size
+            while _cache and (
+                _maxEntries is not None and len(_cache) > _maxEntries
+                or _maxBytes is not None and _stats["bytes"] > _maxBytes
+            ):
+                (oldParadigm, oldSize) = _cache.popitem(last=False)[1]
+                _stats["bytes"] -= oldSize
+                _stats["evictions"] += 1
+    return dict(paradigm)
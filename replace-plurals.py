@@ -5,6 +5,40 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
+def read_csv(filename):
+    # return: {word: set of declensions/conjugations, ...}
+    words = {}
+    for line in read_lines(filename):
+        fields = line.split(",")
+        words.setdefault(fields[0], set()).update(
+            int(c, 10) for c in fields[1:]
+        )
+    return words
+
+def get_singulars_by_plural(filename):
+    """Read plurals and singulars.
+    filename: CSV file with plurals and singulars (like plurals.csv)
+    return:   e.g. {"häät": "hää", ...}"""
+
+    singularsByPlural = {}
+    for line in read_lines(filename):
+        fields = line.split(",")
+        assert len(fields) == 2 and not fields[1].isnumeric()
+        singularsByPlural[fields[0]] = fields[1]
+    return singularsByPlural
+
+def replace_plurals(words, singularsByPlural):
+    """Replace plurals with singulars.
+    words:             {word: set of declensions/conjugations, ...}
+    singularsByPlural: see get_singulars_by_plural()
+    return:            {word: set of declensions/conjugations, ...}"""
+
+    conjugationsByWord = {}  # e.g. {"hää": {18}, ...}
+    for (word, conjugations) in words.items():
+        word = singularsByPlural.get(word, word)
+        conjugationsByWord.setdefault(word, set()).update(conjugations)
+    return conjugationsByWord
+
 def main():
     if len(sys.argv) != 3:
         sys.exit(
@@ -14,20 +48,9 @@ def main():
         )
     (wordFile, sgPlFile) = sys.argv[1:]
 
-    # get singular forms by plural forms
-    singularsByPlural = {}  # e.g. {"häät": "hää", ...}
-    for line in read_lines(sgPlFile):
-        fields = line.split(",")
-        assert len(fields) == 2 and not fields[1].isnumeric()
-        singularsByPlural[fields[0]] = fields[1]
-
-    # read words and declensions/conjugations; replace plurals with singulars
-    conjugationsByWord = {}  # e.g. {"hää": {18}, ...}
-    for line in read_lines(wordFile):
-        fields = line.split(",")
-        word = singularsByPlural.get(fields[0], fields[0])
-        conjugations = {int(c, 10) for c in fields[1:]}
-        conjugationsByWord.setdefault(word, set()).update(conjugations)
+    conjugationsByWord = replace_plurals(
+        read_csv(wordFile), get_singulars_by_plural(sgPlFile)
+    )
 
     # print results
     for word in sorted(conjugationsByWord):
@@ -35,4 +58,5 @@ def main():
             [word] + [str(c) for c in sorted(conjugationsByWord[word])]
         ))
 
-main()
+if __name__ == "__main__":
+    main()
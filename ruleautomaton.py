@@ -0,0 +1,419 @@
+"""Compile an ordered list of rules (regexes that end with "$", like those in
+noundecl.py and verbconj.py) into one deterministic finite automaton that reads
+the word backwards, from the last letter to the first."""
+
+import re
+
+# Supported regex syntax (enough for the rules in this project): literal
+# characters, character classes ("[ab]", "[^a-c]"), ".", groups, "|", "?",
+# "*", "+", "{m}", "{m,n}", "^" and backreferences ("\1") to groups that match
+# exactly one character from a non-negated class. Whitespace is ignored (like
+# in re.VERBOSE). Every regex must end with "$".
+# The parsed regexes are tuples:
+#   ("set", negated, characters)
+#   ("seq", nodes)
+#   ("alt", nodes)
+#   ("rep", node, minimum, maximum or None)
+#   ("group", group_number, node)
+#   ("ref", group_number)
+#   ("start",)
+
+# special input symbols for the automaton: any character that does not occur
+# in the rules, and the start of the word (which is read last)
+_OTHER = 0
+_START = 1
+
+_NO_STATE = -1
+
+class _Parser:
+    # parse a regex into a tuple (see above)
+
+    def __init__(self, regex):
+        self._regex = regex
+        self._pos = 0
+        self._groupCount = 0
+
+    def _error(self, msg):
+        raise ValueError(f"{msg} at position {self._pos} in {self._regex!r}")
+
+    def _peek(self):
+        # the next character that is not whitespace, or None
+        regex = self._regex
+        while self._pos < len(regex) and regex[self._pos].isspace():
+            self._pos += 1
+        return self._regex[self._pos] if self._pos < len(self._regex) else None
+
+    def _next(self):
+        char = self._peek()
+        if char is None:
+            self._error("unexpected end")
+        self._pos += 1
+        return char
+
+    def parse(self):
+        node = self._parse_alternation()
+        if self._peek() is not None:
+            self._error("unexpected character")
+        return node
+
+    def _parse_alternation(self):
+        branches = [self._parse_sequence()]
+        while self._peek() == "|":
+            self._pos += 1
+            branches.append(self._parse_sequence())
+        return branches[0] if len(branches) == 1 else ("alt", tuple(branches))
+
+    def _parse_sequence(self):
+        nodes = []
+        while self._peek() not in (None, "|", ")"):
+            node = self._parse_atom()
+            char = self._peek()
+            if char in ("?", "*", "+"):
+                self._pos += 1
+                node = (
+                    "rep", node, int(char == "+"), 1 if char == "?" else None
+                )
+            elif char == "{":
+                self._pos += 1
+                (minimum, maximum) = self._parse_count()
+                node = ("rep", node, minimum, maximum)
+            nodes.append(node)
+        return nodes[0] if len(nodes) == 1 else ("seq", tuple(nodes))
+
+    def _parse_count(self):
+        # parse "m}" or "m,n}"
+        text = ""
+        while self._peek() != "}":
+            text += self._next()
+        self._pos += 1
+        match = re.fullmatch(r"([0-9]+)(,([0-9]+))?", text)
+        if match is None:
+            self._error("invalid repeat count")
+        minimum = int(match.group(1), 10)
+        maximum = minimum if match.group(3) is None \
+        else int(match.group(3), 10)
+        return (minimum, maximum)
+
+    def _parse_atom(self):
+        char = self._next()
+        if char == "(":
+            if self._peek() == "?":
+                self._error("unsupported group")
+            self._groupCount += 1
+            groupNo = self._groupCount
+            node = self._parse_alternation()
+            if self._next() != ")":
+                self._error("')' expected")
+            return ("group", groupNo, node)
+        if char == "[":
+            return self._parse_class()
+        if char == ".":
+            return ("set", True, frozenset())
+        if char == "^":
+            return ("start",)
+        if char == "\\":
+            char = self._next()
+            if char.isdigit():
+                return ("ref", int(char, 10))
+            if char.isalnum():
+                self._error("unsupported escape")
+            return ("set", False, frozenset(char))
+        if char in "$)*+?{}]":
+            self._error("unsupported or misplaced character")
+        return ("set", False, frozenset(char))
+
+    def _parse_class(self):
+        # parse a character class after "["
+        negated = self._regex[self._pos] == "^"
+        if negated:
+            self._pos += 1
+        chars = set()
+        while True:
+            if self._pos >= len(self._regex):
+                self._error("']' expected")
+            char = self._regex[self._pos]
+            self._pos += 1
+            if char == "]" and chars:
+                break
+            if char == "\\":
+                char = self._regex[self._pos]
+                self._pos += 1
+            if self._regex[self._pos:self._pos+1] == "-" \
+            and self._regex[self._pos+1:self._pos+2] not in ("", "]"):
+                last = self._regex[self._pos+1]
+                self._pos += 2
+                chars.update(chr(c) for c in range(ord(char), ord(last) + 1))
+            else:
+                chars.add(char)
+        return ("set", negated, frozenset(chars))
+
+def _substitute_group(node, groupNo, char):
+    # replace a group and its backreferences with a literal character
+    kind = node[0]
+    if kind == "group" and node[1] == groupNo or kind == "ref" \
+    and node[1] == groupNo:
+        return ("set", False, frozenset(char))
+    if kind in ("seq", "alt"):
+        return (
+            kind, tuple(_substitute_group(n, groupNo, char) for n in node[1])
+        )
+    if kind == "rep":
+        return ("rep", _substitute_group(node[1], groupNo, char)) + node[2:]
+    if kind == "group":
+        return ("group", node[1], _substitute_group(node[2], groupNo, char))
+    return node
+
+def _find_nodes(node, kind):
+    # generate all subnodes of a kind
+    if node[0] == kind:
+        yield node
+    if node[0] in ("seq", "alt"):
+        for n in node[1]:
+            yield from _find_nodes(n, kind)
+    elif node[0] == "rep":
+        yield from _find_nodes(node[1], kind)
+    elif node[0] == "group":
+        yield from _find_nodes(node[2], kind)
+
+def _expand_backreferences(node):
+    # replace backreferences with an alternation, e.g. "([ab])\1" -> "aa|bb"
+    for (kind, groupNo) in _find_nodes(node, "ref"):
+        groups = [g for g in _find_nodes(node, "group") if g[1] == groupNo]
+        if not groups or groups[0][2][0] != "set" or groups[0][2][1]:
+            raise ValueError(
+                "backreferences must refer to a group with a non-negated "
+                "character class"
+            )
+        return _expand_backreferences(("alt", tuple(
+            _substitute_group(node, groupNo, char)
+            for char in sorted(groups[0][2][2])
+        )))
+    return node
+
+def _reverse(node):
+    # reverse the order of the characters a regex matches
+    kind = node[0]
+    if kind == "seq":
+        return ("seq", tuple(_reverse(n) for n in reversed(node[1])))
+    if kind == "alt":
+        return ("alt", tuple(_reverse(n) for n in node[1]))
+    if kind == "rep":
+        return ("rep", _reverse(node[1])) + node[2:]
+    if kind == "group":
+        return ("group", node[1], _reverse(node[2]))
+    return node
+
+class _Nfa:
+    # a nondeterministic finite automaton built from parsed regexes
+
+    def __init__(self):
+        # for each state: list of (symbol, target); symbol is ("set", negated,
+        # characters), _START or None (no input consumed)
+        self.edges = []
+        # for each state: the number of the rule it belongs to
+        self.rules = []
+        # {state: rule_number, ...}
+        self.accepts = {}
+
+    def add_state(self, ruleNo):
+        self.edges.append([])
+        self.rules.append(ruleNo)
+        return len(self.edges) - 1
+
+    def add_regex(self, node, ruleNo):
+        # add a regex; return its initial state
+        start = self.add_state(ruleNo)
+        self.accepts[self._build(node, start, ruleNo)] = ruleNo
+        return start
+
+    def _build(self, node, state, ruleNo):
+        # add states that match node after state; return the last state
+        kind = node[0]
+        if kind in ("set", "start"):
+            target = self.add_state(ruleNo)
+            self.edges[state].append(
+                (node if kind == "set" else _START, target)
+            )
+            return target
+        if kind == "seq":
+            for n in node[1]:
+                state = self._build(n, state, ruleNo)
+            return state
+        if kind == "alt":
+            end = self.add_state(ruleNo)
+            for n in node[1]:
+                self.edges[self._build(n, state, ruleNo)].append((None, end))
+            return end
+        if kind == "rep":
+            (n, minimum, maximum) = node[1:]
+            for i in range(minimum):
+                state = self._build(n, state, ruleNo)
+            if maximum is None:
+                loop = self.add_state(ruleNo)
+                self.edges[state].append((None, loop))
+                self.edges[self._build(n, loop, ruleNo)].append((None, loop))
+                return loop
+            end = self.add_state(ruleNo)
+            for i in range(maximum - minimum):
+                self.edges[state].append((None, end))
+                state = self._build(n, state, ruleNo)
+            self.edges[state].append((None, end))
+            return end
+        if kind == "group":
+            return self._build(node[2], state, ruleNo)
+        raise ValueError(f"unsupported regex element: {kind}")
+
+    def closure(self, states):
+        # add states reachable without consuming input; return a frozenset
+        states = set(states)
+        stack = list(states)
+        while stack:
+            for (symbol, target) in self.edges[stack.pop()]:
+                if symbol is None and target not in states:
+                    states.add(target)
+                    stack.append(target)
+        return frozenset(states)
+
+    def move(self, states, symbol):
+        # states after consuming a character or _OTHER or _START
+        targets = set()
+        for state in states:
+            for (edgeSymbol, target) in self.edges[state]:
+                if edgeSymbol is None:
+                    continue
+                if symbol == _START:
+                    matches = edgeSymbol == _START
+                elif edgeSymbol == _START:
+                    matches = False
+                elif symbol == _OTHER:
+                    matches = edgeSymbol[1]
+                else:
+                    matches = (symbol in edgeSymbol[2]) != edgeSymbol[1]
+                if matches:
+                    targets.add(target)
+        return self.closure(targets)
+
+class RuleAutomaton:
+    """Find the first matching rule of an ordered list of rules with one pass
+    over the word, from the end to the beginning. Equivalent to:
+        for (value, regex) in rules:
+            if regex.search(word) is not None:
+                return value
+        return None
+    The automaton is built on the first match(), so programs that import a
+    module with automata but don't use them all (e.g. noundecl.py for one
+    word) don't pay for building them."""
+
+    def __init__(self, rules):
+        """rules: a sequence of (value, compiled regex), e.g. noundecl's
+        _RULES_2SYLL; each regex must end with "$" and may use re.VERBOSE
+        (see the supported syntax above)"""
+
+        self._rules = tuple(rules)
+        self._values = tuple(value for (value, regex) in rules)
+        # (transitions, others, accepts, startAccepts, bestLeft) when built
+        self._tables = None
+
+    def _build(self):
+        # build the automaton; return and store its tables (in one
+        # assignment, so threads that build it at the same time are safe)
+
+        rules = self._rules
+        ruleCount = len(self._values)
+
+        nfa = _Nfa()
+        starts = []
+        for (ruleNo, (value, regex)) in enumerate(rules):
+            if regex.flags & ~(re.VERBOSE | re.UNICODE) \
+            or not regex.pattern.endswith("$"):
+                raise ValueError(f"unsupported rule: {regex.pattern!r}")
+            node = _reverse(_expand_backreferences(
+                _Parser(regex.pattern[:-1]).parse()
+            ))
+            starts.append(nfa.add_regex(node, ruleNo))
+
+        # all characters that occur in the rules
+        alphabet = set()
+        for edges in nfa.edges:
+            for (symbol, target) in edges:
+                if symbol not in (None, _START):
+                    alphabet.update(symbol[2])
+        alphabet = sorted(alphabet)
+
+        # determinize; the state tables are indexed by state number:
+        # - transitions:  {character: state, ...} (_NO_STATE if the character
+        #   leads nowhere)
+        # - others:       state for any character that is not in transitions
+        # - accepts:      the first rule that has matched (ruleCount = none)
+        # - startAccepts: the first rule that matches at the start of the word
+        # - bestLeft:     the first rule that can still match after this state
+        transitions = []
+        others = []
+        accepts = []
+        startAccepts = []
+        bestLeft = []
+
+        def get_accept(states):
+            return min(
+                (nfa.accepts[s] for s in states if s in nfa.accepts),
+                default=ruleCount
+            )
+
+        stateNumbers = {}
+        queue = [nfa.closure(starts)]
+        stateNumbers[queue[0]] = 0
+        while queue:
+            states = queue.pop(0)
+            targets = {}
+            for symbol in alphabet + [_OTHER]:
+                target = nfa.move(states, symbol)
+                if target:
+                    if target not in stateNumbers:
+                        stateNumbers[target] = len(stateNumbers)
+                        queue.append(target)
+                    targets[symbol] = stateNumbers[target]
+                else:
+                    targets[symbol] = _NO_STATE
+            other = targets.pop(_OTHER)
+            if other == _NO_STATE:
+                targets = dict(
+                    (c, s) for (c, s) in targets.items() if s != _NO_STATE
+                )
+            transitions.append(targets)
+            others.append(other)
+            accepts.append(get_accept(states))
+            startAccepts.append(get_accept(nfa.move(states, _START)))
+            bestLeft.append(min(
+                (nfa.rules[s] for s in states if any(
+                    symbol is not None for (symbol, target) in nfa.edges[s]
+                )),
+                default=ruleCount
+            ))
+
+        self._tables = (transitions, others, accepts, startAccepts, bestLeft)
+        return self._tables
+
+    def __len__(self):
+        # number of states
+        return len((self._tables or self._build())[0])
+
+    def match(self, word):
+        """word:   the word to classify
+        return: the value of the first matching rule, or None"""
+
+        (transitions, others, accepts, startAccepts, bestLeft) = (
+            self._tables or self._build()
+        )
+        best = len(self._values)
+        state = 0
+        for char in reversed(word):
+            if accepts[state] < best:
+                best = accepts[state]
+            if bestLeft[state] >= best:
+                break
+            state = transitions[state].get(char, others[state])
+            if state == _NO_STATE:
+                break
+        else:
+            best = min(best, accepts[state], startAccepts[state])
+        return self._values[best] if best < len(self._values) else None
@@ -65,13 +65,12 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
-def main():
-    if len(sys.argv) != 2:
-        sys.exit(
-            "Print a table of noun/verb counts by declension/conjugation, "
-            "syllable count and ending. Argument: CSV file with words (no "
-            "compounds)."
-        )
+def get_table(lines):
+    """Get a table of noun/verb counts by declension/conjugation, syllable
+    count and ending.
+    lines:    an iterable of CSV lines with words (no compounds) and their
+              declensions/conjugations
+    generate: lines of the table"""
 
     # word counts by declension/conjugation and ending
     totalCnts = collections.Counter()
@@ -83,7 +82,7 @@ def main():
     cnsVwlEndCnts = collections.Counter()
     cnsEndCnts = collections.Counter()
 
-    for line in read_lines(sys.argv[1]):
+    for line in lines:
         fields = line.split(",")
         word = fields[0]
         conjugations = {int(c, 10) for c in fields[1:]} & set(CONJUGATIONS)
@@ -119,12 +118,26 @@ def main():
         totalCnts,
     )
 
-    print(INTRO)
+    yield INTRO
     for conj in CONJUGATIONS:
-        print(
+        yield (
             f"{conj:4} {CONJUGATIONS[conj]:9} "
             + " ".join(f"{c[conj]:5}" for c in counters)
         )
-    print("     TOTAL    ", " ".join(f"{sum(c.values()):5}" for c in counters))
+    yield "     TOTAL     " + " ".join(
+        f"{sum(c.values()):5}" for c in counters
+    )
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit(
+            "Print a table of noun/verb counts by declension/conjugation, "
+            "syllable count and ending. Argument: CSV file with words (no "
+            "compounds)."
+        )
+
+    for line in get_table(read_lines(sys.argv[1])):
+        print(line)
 
-main()
+if __name__ == "__main__":
+    main()
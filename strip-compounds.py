@@ -5,6 +5,25 @@ def read_lines(filename):
         handle.seek(0)
         yield from (l.rstrip("\n") for l in handle)
 
+def read_csv(filename):
+    # return: {word: set of declensions/conjugations, ...} in file order
+    words = {}
+    for line in read_lines(filename):
+        fields = line.split(",")
+        words.setdefault(fields[0], set()).update(
+            int(c, 10) for c in fields[1:]
+        )
+    return words
+
+def strip_compounds(words, compounds):
+    """Delete compounds.
+    words:     {word: set of declensions/conjugations, ...}
+    compounds: an iterable of compounds with parts separated by "_"
+    return:    words without compounds, in the same order"""
+
+    compounds = {c.replace("_", "") for c in compounds}
+    return dict((w, c) for (w, c) in words.items() if w not in compounds)
+
 def main():
     if len(sys.argv) != 3:
         sys.exit(
@@ -14,10 +33,10 @@ def main():
         )
     (wordFile, compoundFile) = sys.argv[1:]
 
-    compounds = {l.replace("_", "") for l in read_lines(compoundFile)}
+    words = strip_compounds(read_csv(wordFile), read_lines(compoundFile))
 
-    for line in read_lines(wordFile):
-        if line.split(",")[0] not in compounds:
-            print(line)
+    for (word, conjs) in words.items():
+        print(",".join([word] + [str(c) for c in sorted(conjs)]))
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Test analyze_word.py: decline and conjugate the words in the test files of
+test-decline_noun.py and test-conjugate_verb.py with decline_noun() and
+conjugate_verb() and check that each inflected form is analyzed as its lemma,
+one of its declensions/conjugations and form, both with and without a lexicon
+file."""
+
+import glob, os, sys, tempfile
+from analyze_word import Analyzer, VERB_LEMMA_FORM, generate_analyses
+from conjugate_verb import ALL_FORMS as VERB_FORMS, \
+ITEM_NAMES as VERB_ITEM_NAMES, conjugate_verb
+from decline_noun import ALL_FORMS as NOUN_FORMS, \
+ITEM_NAMES as NOUN_ITEM_NAMES, decline_noun
+from lexicon import Lexicon, write_lexicon
+from noundecl import get_declensions
+from verbconj import get_conjugations
+
+NOUN_TEST_DIR = "decline_noun-tests"
+VERB_TEST_DIR = "conjugate_verb-tests"
+
+def read_test_words(directory):
+    # get the lemmas (first fields) of all CSV files in a test directory
+    words = set()
+    for path in glob.glob(os.path.join(directory, "*.csv")):
+        with open(path, "rt", encoding="utf8") as handle:
+            handle.seek(0)
+            for line in handle:
+                line = line.rstrip("\n")
+                if line and not line.startswith("#"):
+                    words.add(line.split(",")[0])
+    return sorted(words)
+
+def write_csv(filename, words, get_classes):
+    # write words and their declensions/conjugations like nouns.csv/verbs.csv
+    # return: {word: classes, ...} (words without classes are omitted)
+    classesByWord = {}
+    with open(filename, "wt", encoding="utf8") as handle:
+        for word in words:
+            classes = get_classes(word)
+            if classes:
+                classesByWord[word] = classes
+                print(",".join((word,) + tuple(str(c) for c in classes)),
+                      file=handle)
+    return classesByWord
+
+def get_expected(nouns, verbs):
+    # generate (inflected, lemma, declensions/conjugations, form name) with
+    # decline_noun() and conjugate_verb() (which decide consonant gradation
+    # themselves)
+    # nouns, verbs: {lemma: declensions/conjugations, ...}
+
+    for (noun, decls) in nouns.items():
+        for form in NOUN_FORMS:
+            formName = "-".join(NOUN_ITEM_NAMES[i] for i in form)
+            for inflected in decline_noun(noun, *form):
+                yield (inflected, noun, decls, formName)
+
+    for (verb, conjs) in verbs.items():
+        yield (verb, verb, conjs, VERB_LEMMA_FORM)
+        for form in VERB_FORMS:
+            formName = "-".join(VERB_ITEM_NAMES[i] for i in form)
+            for inflected in conjugate_verb(verb, *form):
+                yield (inflected, verb, conjs, formName)
+
+def run_test(analyzer, expected):
+    # expected: [(inflected, lemma, declensions/conjugations, form name),
+    # ...]; one of the declensions/conjugations must be in the analyses
+    # return: error count
+    errorCnt = 0
+    for (inflected, lemma, conjs, formName) in expected:
+        analyses = analyzer.analyze(inflected)
+        if not any((lemma, c, formName) in analyses for c in conjs):
+            print(
+                f"Error: '{inflected}': expected {lemma}, {formName} in "
+                f"{analyses}",
+                file=sys.stderr
+            )
+            errorCnt += 1
+    return errorCnt
+
+def main():
+    print("Testing analyze_word.py...")
+    totalErrorCnt = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        nounFile = os.path.join(directory, "nouns.csv")
+        verbFile = os.path.join(directory, "verbs.csv")
+        lexiconFile = os.path.join(directory, "lexicon.bin")
+
+        nouns = write_csv(
+            nounFile, read_test_words(NOUN_TEST_DIR), get_declensions
+        )
+        verbs = write_csv(
+            verbFile, read_test_words(VERB_TEST_DIR), get_conjugations
+        )
+        expected = list(get_expected(nouns, verbs))
+        print(
+            f"Testing {len(expected)} inflected form(s) of {len(nouns)} "
+            f"noun(s) and {len(verbs)} verb(s)."
+        )
+
+        analyzer = Analyzer(generate_analyses(nounFile, verbFile))
+        errorCnt = run_test(analyzer, expected)
+        print(f"Without lexicon file: {errorCnt} error(s).")
+        totalErrorCnt += errorCnt
+
+        write_lexicon(lexiconFile, generate_analyses(nounFile, verbFile))
+        with Lexicon(lexiconFile) as lexicon:
+            if len(lexicon) != len(analyzer):
+                print(
+                    f"Error: {len(lexicon)} form(s) in the lexicon file, "
+                    f"{len(analyzer)} without it",
+                    file=sys.stderr
+                )
+                totalErrorCnt += 1
+            errorCnt = run_test(lexicon, expected)
+        print(f"With lexicon file: {errorCnt} error(s).")
+        totalErrorCnt += errorCnt
+
+    print(f"Detected {totalErrorCnt} error(s).")
+
+main()
@@ -0,0 +1,171 @@
+"""Test classcache.py: warm up the cache with the words in the test files of
+test-decline_noun.py and test-conjugate_verb.py, save and load it and check
+that the classifiers give the same results with and without it, and that the
+cache file is not used after any of the cached modules has changed."""
+
+import glob, os, shutil, subprocess, sys, tempfile
+import classcache
+from countsyll import count_syllables
+from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
+from noundecl import get_declensions
+from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
+from verbconj import get_conjugations
+
+NOUN_TEST_DIR = "decline_noun-tests"
+VERB_TEST_DIR = "conjugate_verb-tests"
+
+# the modules whose changes must invalidate the cache file
+MODULES = (
+    "classcache", "countsyll", "noundecl", "verbconj", "noun_consgrad",
+    "verb_consgrad", "ruleautomaton",
+)
+
+# run in a copy of the modules: save the cache, or print whether it was loaded
+SAVE_PROGRAM = """import classcache, countsyll
+classcache.enable()
+countsyll.count_syllables("kuusi")
+classcache.save("classcache.bin")"""
+LOAD_PROGRAM = """import classcache
+print(classcache.load("classcache.bin"))"""
+
+def read_test_words(directory):
+    # get the lemmas (first fields) of all CSV files in a test directory
+    words = set()
+    for path in glob.glob(os.path.join(directory, "*.csv")):
+        with open(path, "rt", encoding="utf8") as handle:
+            handle.seek(0)
+            for line in handle:
+                line = line.rstrip("\n")
+                if line and not line.startswith("#"):
+                    words.add(line.split(",")[0])
+    return sorted(words)
+
+def get_words():
+    # return: {word: set of declensions/conjugations, ...} like words.csv
+    wordsAndConjs = {}
+    for (directory, get_classes) in (
+        (NOUN_TEST_DIR, get_declensions), (VERB_TEST_DIR, get_conjugations)
+    ):
+        for word in read_test_words(directory):
+            wordsAndConjs.setdefault(word, set()).update(get_classes(word))
+    return dict((w, c) for (w, c) in wordsAndConjs.items() if c)
+
+def get_results(wordsAndConjs):
+    # classify the words like classcache.warm_up() does
+    results = []
+    for (word, conjs) in wordsAndConjs.items():
+        results.append((word, count_syllables(word)))
+        if any(c <= 49 for c in conjs):
+            decls = get_declensions(word)
+            results.append((word, decls))
+            for decl in sorted(set(decls) | conjs):
+                if decl <= 49:
+                    results.append(
+                        (word, decl, get_noun_cons_grad(word, decl))
+                    )
+        if any(c >= 52 for c in conjs):
+            conjs2 = get_conjugations(word)
+            results.append((word, conjs2))
+            for conj in sorted(set(conjs2) | conjs):
+                if conj >= 52:
+                    results.append(
+                        (word, conj, get_verb_cons_grad(word, conj))
+                    )
+    return results
+
+def print_error(msg):
+    print("Error: " + msg, file=sys.stderr)
+
+def test_results(wordsAndConjs, directory):
+    # compare the results without the cache and with a saved and loaded
+    # cache; return: error count
+
+    wordFile = os.path.join(directory, "words.csv")
+    cacheFile = os.path.join(directory, "classcache.bin")
+    with open(wordFile, "wt", encoding="utf8") as handle:
+        for (word, conjs) in wordsAndConjs.items():
+            print(",".join([word] + [str(c) for c in sorted(conjs)]),
+                  file=handle)
+
+    errorCnt = 0
+    classcache.disable()
+    expected = get_results(wordsAndConjs)
+
+    # like morphserver.py: warm_up() must store the results anyway
+    if classcache.load(cacheFile, memoize=False):
+        print_error("a missing cache file was loaded")
+        errorCnt += 1
+    classcache.warm_up(wordFile)
+    entryCnt = classcache.get_stats()["entries"]
+    if entryCnt == 0:
+        print_error("warm_up() after load(memoize=False) cached nothing")
+        errorCnt += 1
+    count_syllables("xyzzy")
+    if classcache.get_stats()["entries"] != entryCnt:
+        print_error("warm_up() did not restore memoize=False")
+        errorCnt += 1
+    classcache.save(cacheFile)
+
+    classcache.disable()
+    if not classcache.load(cacheFile, memoize=False):
+        print_error("the cache file was not loaded")
+        errorCnt += 1
+    if classcache.get_stats()["entries"] != entryCnt:
+        print_error(
+            f"expected {entryCnt} entries, got "
+            f"{classcache.get_stats()['entries']}"
+        )
+        errorCnt += 1
+    results = get_results(wordsAndConjs)
+    for (result, expectedResult) in zip(results, expected):
+        if result != expectedResult:
+            print_error(f"expected {expectedResult}, got {result}")
+            errorCnt += 1
+    # everything came from the file
+    if classcache.get_stats()["misses"]:
+        print_error(f"{classcache.get_stats()['misses']} cache misses")
+        errorCnt += 1
+    classcache.disable()
+    return errorCnt
+
+def run_program(program, directory):
+    # run a Python program in a directory; return its output
+    return subprocess.run(
+        (sys.executable, "-c", program), cwd=directory, check=True,
+        stdout=subprocess.PIPE, text=True
+    ).stdout.strip()
+
+def test_invalidation(directory):
+    # check that changing any of the cached modules invalidates the cache
+    # file; return: error count
+
+    for module in MODULES:
+        shutil.copy(module + ".py", directory)
+
+    errorCnt = 0
+    for module in MODULES:
+        run_program(SAVE_PROGRAM, directory)
+        if run_program(LOAD_PROGRAM, directory) != "True":
+            print_error("the cache file was not loaded")
+            errorCnt += 1
+        with open(os.path.join(directory, module + ".py"), "at") as handle:
+            handle.write("# changed\n")
+        if run_program(LOAD_PROGRAM, directory) != "False":
+            print_error(f"the cache file was loaded after {module} changed")
+            errorCnt += 1
+    return errorCnt
+
+def main():
+    print("Testing classcache.py...")
+    wordsAndConjs = get_words()
+    with tempfile.TemporaryDirectory() as directory:
+        errorCnt = test_results(wordsAndConjs, directory)
+    with tempfile.TemporaryDirectory() as directory:
+        errorCnt += test_invalidation(directory)
+    print(
+        f"Tested {len(wordsAndConjs)} word(s) and "
+        f"{len(MODULES)} module(s)."
+    )
+    print(f"Detected {errorCnt} error(s).")
+
+main()
@@ -0,0 +1,103 @@
+"""Test classify.py: check that classify_nouns() and classify_verbs() generate
+the same results as the per-word functions, and that get_declensions() and
+get_conjugations() give the same results with and without syllCnt, for the
+words in the test files of test-decline_noun.py and test-conjugate_verb.py and
+in generated-lists/nouns.csv and verbs.csv (if they exist)."""
+
+import glob, os, sys
+from classify import classify_nouns, classify_verbs
+from countsyll import count_syllables
+from noundecl import get_declensions
+from verbconj import get_conjugations
+from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
+from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
+
+NOUN_TEST_DIR = "decline_noun-tests"
+VERB_TEST_DIR = "conjugate_verb-tests"
+NOUN_FILE = "generated-lists/nouns.csv"
+VERB_FILE = "generated-lists/verbs.csv"
+
+def read_words(filename):
+    # get the words (first fields) of a CSV file, skipping comments
+    with open(filename, "rt", encoding="utf8") as handle:
+        handle.seek(0)
+        for line in handle:
+            line = line.rstrip("\n")
+            if line and not line.startswith("#"):
+                yield line.split(",")[0]
+
+def get_words(directory, filename):
+    words = set()
+    for path in glob.glob(os.path.join(directory, "*.csv")):
+        words.update(read_words(path))
+    if os.path.isfile(filename):
+        words.update(read_words(filename))
+    else:
+        print(f"Warning: {filename} not found, skipping", file=sys.stderr)
+    return sorted(words)
+
+def run_test(words, classify, get_classes, get_cons_grad):
+    # classify: classify_nouns or classify_verbs
+    # get_classes: get_declensions or get_conjugations
+    # return: error count
+
+    errorCnt = 0
+
+    # read the words one at a time
+    readCnt = 0
+    def generate_words():
+        nonlocal readCnt
+        for word in words:
+            readCnt += 1
+            yield word
+
+    results = classify(generate_words())
+    for (i, word) in enumerate(words):
+        result = next(results)
+        if readCnt != i + 1:
+            print(f"Error: '{word}': read {readCnt} word(s)", file=sys.stderr)
+            errorCnt += 1
+
+        syllCnt = count_syllables(word.strip("'- "))
+        classes = get_classes(word)
+        expected = (
+            word, classes, tuple(get_cons_grad(word, c) for c in classes),
+            syllCnt
+        )
+        if result != expected:
+            print(
+                f"Error: '{word}': expected {expected}, got {result}",
+                file=sys.stderr
+            )
+            errorCnt += 1
+
+        for useExceptions in (True, False):
+            if get_classes(word, useExceptions, syllCnt) \
+            != get_classes(word, useExceptions):
+                print(
+                    f"Error: '{word}': different result with syllCnt "
+                    f"({useExceptions=})",
+                    file=sys.stderr
+                )
+                errorCnt += 1
+
+    if next(results, None) is not None:
+        print("Error: too many results", file=sys.stderr)
+        errorCnt += 1
+    return errorCnt
+
+def main():
+    print("Testing classify.py...")
+    nouns = get_words(NOUN_TEST_DIR, NOUN_FILE)
+    verbs = get_words(VERB_TEST_DIR, VERB_FILE)
+
+    errorCnt = run_test(
+        nouns, classify_nouns, get_declensions, get_noun_cons_grad
+    ) + run_test(
+        verbs, classify_verbs, get_conjugations, get_verb_cons_grad
+    )
+
+    print(f"Tested {len(nouns)} noun(s) and {len(verbs)} verb(s).")
+    print(f"Detected {errorCnt} error(s).")
+
+main()
@@ -1,7 +1,8 @@
 """Test conjugate_verb.py by comparing the output to test files."""
 
 import os, sys
-from conjugate_verb import ALL_FORMS, ITEM_NAMES, conjugate_verb
+from conjugate_verb import ALL_FORMS, ITEM_NAMES, conjugate_verb, \
+conjugate_verb_paradigm
 
 TEST_DIR = "conjugate_verb-tests"  # read test files from here
 
@@ -56,6 +57,31 @@ def run_test(verbForm):
 
     return (len(verbs), errorCnt)
 
+def run_paradigm_test():
+    # test that conjugate_verb_paradigm() agrees with conjugate_verb()
+    # return: (verb_count, error_count)
+
+    verbs = set()
+    for verbForm in ALL_FORMS:
+        verbs.update(read_csv(verbForm))
+
+    errorCnt = 0
+    for verb in sorted(verbs):
+        paradigm = conjugate_verb_paradigm(verb)
+        for verbForm in ALL_FORMS:
+            expected = conjugate_verb(verb, *verbForm)
+            if paradigm[verbForm] != expected:
+                print(
+                    f"Error: paradigm of '{verb}' in "
+                    f"{format_test_name(verbForm)}: expected '"
+                    + "/".join(sorted(expected)) + "', got '"
+                    + "/".join(sorted(paradigm[verbForm])) + "'",
+                    file=sys.stderr
+                )
+                errorCnt += 1
+
+    return (len(verbs), errorCnt)
+
 def main():
     print("Testing conjugate_verb.py...")
     totalVerbCnt = totalErrorCnt = 0
@@ -69,6 +95,10 @@ def main():
         f"Tested {len(ALL_FORMS)} verb form(s) (except if file not found) "
         f"and {totalVerbCnt} verb(s)."
     )
+
+    (verbCnt, errorCnt) = run_paradigm_test()
+    totalErrorCnt += errorCnt
+    print(f"Tested the paradigms of {verbCnt} verb(s).")
     print(f"Detected {totalErrorCnt} error(s).")
 
 main()
@@ -1,8 +1,8 @@
 # test decline_noun.py by comparing the output to test files
 
 import os, sys
-from decline_noun \
-import ALL_FORMS, C_NOM, C_GEN, ITEM_NAMES, N_SG, decline_noun
+from decline_noun import ALL_FORMS, C_NOM, C_GEN, ITEM_NAMES, N_SG, \
+decline_noun, decline_noun_paradigm
 from noundecl import get_declensions
 
 TEST_DIR = "decline_noun-tests"  # read test files from here
@@ -59,6 +59,31 @@ def run_test(case, number):
 
     return (len(words), errorCnt)
 
+def run_paradigm_test():
+    # test that decline_noun_paradigm() agrees with decline_noun()
+    # return: (word_count, error_count)
+
+    words = set()
+    for (case, number) in ALL_FORMS:
+        if not (case == C_NOM and number == N_SG):
+            words.update(read_csv(case, number))
+
+    errorCnt = 0
+    for word in sorted(words):
+        paradigm = decline_noun_paradigm(word)
+        for (case, number) in ALL_FORMS:
+            expected = decline_noun(word, case, number)
+            if paradigm[(case, number)] != expected:
+                print(
+                    f"Error: paradigm of '{word}' in {ITEM_NAMES[case]}-"
+                    f"{ITEM_NAMES[number]}: expected '"
+                    + "/".join(sorted(expected)) + "', got '"
+                    + "/".join(sorted(paradigm[(case, number)])) + "'"
+                )
+                errorCnt += 1
+
+    return (len(words), errorCnt)
+
 def main():
     print("Testing decline_noun.py...")
     totalWordCnt = totalErrorCnt = 0
@@ -72,6 +97,10 @@ def main():
         f"Tested {len(ALL_FORMS)} case/number combination(s) and "
         f"{totalWordCnt} noun(s)."
     )
+
+    (wordCnt, errorCnt) = run_paradigm_test()
+    totalErrorCnt += errorCnt
+    print(f"Tested the paradigms of {wordCnt} noun(s).")
     print(f"Detected {totalErrorCnt} error(s).")
 
 main()
@@ -0,0 +1,84 @@
+"""Test inflected_by_length.py: check that NOUN_LENGTH_CHANGE and
+VERB_LENGTH_CHANGE cover the length of every inflected form of the words in
+the test files of test-decline_noun.py and test-conjugate_verb.py in each of
+their declensions/conjugations, so that no valid form is skipped."""
+
+import glob, os, sys
+from inflected_by_length import NOUN_LENGTH_CHANGE, VERB_LENGTH_CHANGE
+from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
+from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
+from decline_noun import decline_noun_paradigm_specific
+from conjugate_verb import conjugate_verb_paradigm_specific
+from noundecl import get_declensions
+from verbconj import get_conjugations
+
+NOUN_TEST_DIR = "decline_noun-tests"
+VERB_TEST_DIR = "conjugate_verb-tests"
+
+def read_test_words(directory):
+    # get the lemmas (first fields) of all CSV files in a test directory
+    words = set()
+    for path in glob.glob(os.path.join(directory, "*.csv")):
+        with open(path, "rt", encoding="utf8") as handle:
+            handle.seek(0)
+            for line in handle:
+                line = line.rstrip("\n")
+                if line and not line.startswith("#"):
+                    words.add(line.split(",")[0])
+    return sorted(words)
+
+def print_error(msg):
+    print("Error: " + msg, file=sys.stderr)
+
+def test_length_change(words, get_classes, get_cons_grad, get_paradigm,
+lengthChange, constName):
+    # check the length change of each inflected form of each word in each of
+    # its declensions/conjugations; return: (error count, form count, least
+    # change, most change)
+
+    errorCnt = formCnt = 0
+    (least, most) = (0, 0)
+    for word in words:
+        for conj in get_classes(word):
+            consGrad = get_cons_grad(word, conj)
+            for forms in get_paradigm(word, conj, consGrad).values():
+                for inflected in forms:
+                    change = len(inflected) - len(word)
+                    if not lengthChange[0] <= change <= lengthChange[1]:
+                        print_error(
+                            f"{inflected} ({word} {conj}): length change "
+                            f"{change} is outside {constName}={lengthChange}"
+                        )
+                        errorCnt += 1
+                    (least, most) = (min(least, change), max(most, change))
+                    formCnt += 1
+    return (errorCnt, formCnt, least, most)
+
+def main():
+    print("Testing inflected_by_length.py...")
+    errorCnt = 0
+    for (directory, get_classes, get_cons_grad, get_paradigm, lengthChange,
+    constName) in (
+        (
+            NOUN_TEST_DIR, get_declensions, get_noun_cons_grad,
+            decline_noun_paradigm_specific, NOUN_LENGTH_CHANGE,
+            "NOUN_LENGTH_CHANGE"
+        ),
+        (
+            VERB_TEST_DIR, get_conjugations, get_verb_cons_grad,
+            conjugate_verb_paradigm_specific, VERB_LENGTH_CHANGE,
+            "VERB_LENGTH_CHANGE"
+        ),
+    ):
+        (wordErrorCnt, formCnt, least, most) = test_length_change(
+            read_test_words(directory), get_classes, get_cons_grad,
+            get_paradigm, lengthChange, constName
+        )
+        errorCnt += wordErrorCnt
+        print(
+            f"{constName}: checked {formCnt} form(s); length changes seen: "
+            f"{least}...{most}."
+        )
+    print(f"Detected {errorCnt} error(s).")
+
+main()
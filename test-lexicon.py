@@ -0,0 +1,144 @@
+"""Test lexicon.py: write a lexicon file of the paradigms of the words in the
+test files of test-decline_noun.py and test-conjugate_verb.py and compare
+analyze() and analyze_prefix() to the generated paradigms; check that
+truncated files are rejected."""
+
+import glob, os, sys, tempfile
+from analyze_word import generate_analyses
+from lexicon import Lexicon, get_source_hash, write_lexicon
+from noundecl import get_declensions
+from verbconj import get_conjugations
+
+NOUN_TEST_DIR = "decline_noun-tests"
+VERB_TEST_DIR = "conjugate_verb-tests"
+
+def read_test_words(directory):
+    # get the lemmas (first fields) of all CSV files in a test directory
+    words = set()
+    for path in glob.glob(os.path.join(directory, "*.csv")):
+        with open(path, "rt", encoding="utf8") as handle:
+            handle.seek(0)
+            for line in handle:
+                line = line.rstrip("\n")
+                if line and not line.startswith("#"):
+                    words.add(line.split(",")[0])
+    return sorted(words)
+
+def write_csv(filename, words, get_classes):
+    # write words and their declensions/conjugations like nouns.csv/verbs.csv
+    with open(filename, "wt", encoding="utf8") as handle:
+        for word in words:
+            classes = get_classes(word)
+            if classes:
+                print(",".join((word,) + tuple(str(c) for c in classes)),
+                      file=handle)
+
+def print_error(msg):
+    print("Error: " + msg, file=sys.stderr)
+
+def test_analyze(lexicon, expected):
+    # expected: {inflected: sorted tuple of analyses, ...}
+    # return: error count
+    errorCnt = 0
+    for (inflected, analyses) in expected.items():
+        result = lexicon.analyze(inflected)
+        if result != analyses:
+            print_error(f"'{inflected}': expected {analyses}, got {result}")
+            errorCnt += 1
+        # truncated forms that are not forms themselves
+        for word in (inflected[:-1], inflected + "#"):
+            if word not in expected and lexicon.analyze(word):
+                print_error(f"'{word}' should not be found")
+                errorCnt += 1
+    return errorCnt
+
+def test_analyze_prefix(lexicon, expected, prefixes):
+    # expected: {inflected: sorted tuple of analyses, ...}
+    # return: error count
+
+    # {prefix: [(inflected, analyses), ...] in lexicon order, ...}
+    byPrefix = dict((p, []) for p in prefixes)
+    for inflected in sorted(expected, key=lambda f: f.encode("utf8")):
+        for i in range(len(inflected) + 1):
+            if inflected[:i] in byPrefix:
+                byPrefix[inflected[:i]].append(
+                    (inflected, expected[inflected])
+                )
+
+    errorCnt = 0
+    for (prefix, items) in byPrefix.items():
+        result = list(lexicon.analyze_prefix(prefix))
+        if result != items:
+            print_error(
+                f"prefix '{prefix}': expected {len(items)} form(s), got "
+                f"{len(result)} (or different forms/analyses)"
+            )
+            errorCnt += 1
+    return errorCnt
+
+def test_truncated(lexiconFile):
+    # truncate a copy of a lexicon file in various places and check that
+    # Lexicon() raises ValueError; return: error count
+    with open(lexiconFile, "rb") as handle:
+        data = handle.read()
+    truncatedFile = lexiconFile + ".truncated"
+    errorCnt = 0
+    for size in (0, 1, 63, 64, 65, len(data) // 2, len(data) - 1):
+        with open(truncatedFile, "wb") as handle:
+            handle.write(data[:size])
+        try:
+            Lexicon(truncatedFile).close()
+        except ValueError:
+            pass
+        else:
+            print_error(f"a file truncated to {size} bytes was accepted")
+            errorCnt += 1
+    return errorCnt
+
+def main():
+    print("Testing lexicon.py...")
+    errorCnt = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        nounFile = os.path.join(directory, "nouns.csv")
+        verbFile = os.path.join(directory, "verbs.csv")
+        lexiconFile = os.path.join(directory, "lexicon.bin")
+        write_csv(nounFile, read_test_words(NOUN_TEST_DIR), get_declensions)
+        write_csv(verbFile, read_test_words(VERB_TEST_DIR), get_conjugations)
+
+        # {inflected: sorted tuple of analyses, ...}
+        expected = {}
+        lemmas = set()
+        for (inflected, lemma, conj, formName) in generate_analyses(
+            nounFile, verbFile
+        ):
+            expected.setdefault(inflected, set()).add(
+                (lemma, conj, formName)
+            )
+            lemmas.add(lemma)
+        expected = dict((f, tuple(sorted(a))) for (f, a) in expected.items())
+
+        write_lexicon(lexiconFile, generate_analyses(nounFile, verbFile))
+        with Lexicon(lexiconFile) as lexicon:
+            if len(lexicon) != len(expected):
+                print_error(
+                    f"expected {len(expected)} form(s), got {len(lexicon)}"
+                )
+                errorCnt += 1
+            if lexicon.sourceHash != get_source_hash():
+                print_error("wrong source hash")
+                errorCnt += 1
+
+            errorCnt += test_analyze(lexicon, expected)
+            prefixes = lemmas | set(f[:1] for f in expected) | {"", "#"}
+            errorCnt += test_analyze_prefix(lexicon, expected, prefixes)
+
+        errorCnt += test_truncated(lexiconFile)
+
+    print(
+        f"Tested {len(expected)} inflected form(s) and {len(prefixes)} "
+        "prefix(es)."
+    )
+    print(f"Detected {errorCnt} error(s).")
+
+main()
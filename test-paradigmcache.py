@@ -0,0 +1,180 @@
+"""Test paradigmcache.py: check least recently used eviction and the
+statistics, and that decline_noun.py and conjugate_verb.py give the same
+results with and without the cache for the words in the test files of
+test-decline_noun.py and test-conjugate_verb.py."""
+
+import glob, os, sys
+import paradigmcache
+from conjugate_verb import ALL_FORMS as VERB_FORMS, conjugate_verb_specific, \
+conjugate_verb_paradigm_specific
+from decline_noun import ALL_FORMS as NOUN_FORMS, decline_noun_specific, \
+decline_noun_paradigm_specific
+from noun_consgrad import get_consonant_gradation as get_noun_cons_grad
+from noundecl import get_declensions
+from verb_consgrad import get_consonant_gradation as get_verb_cons_grad
+from verbconj import get_conjugations
+
+NOUN_TEST_DIR = "decline_noun-tests"
+VERB_TEST_DIR = "conjugate_verb-tests"
+
+def read_test_words(directory):
+    # get the lemmas (first fields) of all CSV files in a test directory
+    words = set()
+    for path in glob.glob(os.path.join(directory, "*.csv")):
+        with open(path, "rt", encoding="utf8") as handle:
+            handle.seek(0)
+            for line in handle:
+                line = line.rstrip("\n")
+                if line and not line.startswith("#"):
+                    words.add(line.split(",")[0])
+    return sorted(words)
+
+def print_error(msg):
+    print("Error: " + msg, file=sys.stderr)
+
+def check_stats(description, expected):
+    # expected: {statistic: value, ...}; return: error count
+    stats = paradigmcache.get_stats()
+    errorCnt = 0
+    for (name, value) in expected.items():
+        if stats[name] != value:
+            print_error(
+                f"{description}: expected {name}={value}, got {stats[name]}"
+            )
+            errorCnt += 1
+    return errorCnt
+
+def test_eviction():
+    # test the cache with a dummy paradigm function; return: error count
+
+    computed = []  # keys in the order they were computed
+    def get_paradigm(key):
+        computed.append(key)
+        return {"form": key * 100}
+
+    def get(key):
+        return paradigmcache.get_paradigm(key, get_paradigm, key)
+
+    errorCnt = 0
+
+    paradigmcache.enable(maxEntries=3)
+    for key in "abc":
+        get(key)
+    get("a")  # "b" is now the least recently used
+    get("d")  # evicts "b"
+    errorCnt += check_stats(
+        "maxEntries", {"hits": 1, "misses": 4, "evictions": 1, "entries": 3}
+    )
+    del computed[:]
+    for key in "acdb":
+        get(key)
+    # "b" was recomputed and evicted "a", the least recently used
+    if computed != ["b"]:
+        print_error(f"maxEntries: expected ['b'] recomputed, got {computed}")
+        errorCnt += 1
+    del computed[:]
+    get("a")
+    if computed != ["a"]:
+        print_error("maxEntries: 'a' should have been evicted")
+        errorCnt += 1
+
+    # the caller may modify the paradigm it gets
+    get("a")["form"] = None
+    if get("a") != {"form": "a" * 100}:
+        print_error("a modified paradigm was cached")
+        errorCnt += 1
+
+    # a byte limit that fits two of the paradigms
+    paradigmcache.enable(maxEntries=None)
+    get("a")
+    size = paradigmcache.get_stats()["bytes"]
+    paradigmcache.enable(maxEntries=None, maxBytes=size * 2)
+    for key in "abc":
+        get(key)
+    errorCnt += check_stats("maxBytes", {
+        "hits": 0, "misses": 3, "evictions": 1, "entries": 2,
+        "bytes": size * 2,
+    })
+
+    paradigmcache.disable()
+    del computed[:]
+    get("b")
+    get("b")
+    if paradigmcache.is_enabled() or computed != ["b", "b"]:
+        print_error("disable() did not disable the cache")
+        errorCnt += 1
+    errorCnt += check_stats("disabled", {"entries": 0, "bytes": 0})
+
+    return errorCnt
+
+def get_noun_results(nouns):
+    # generate the paradigm and each inflected form of each noun in each of
+    # its declensions
+    for noun in nouns:
+        for decl in get_declensions(noun):
+            consGrad = get_noun_cons_grad(noun, decl)
+            yield (noun, decl, decline_noun_paradigm_specific(
+                noun, decl, consGrad
+            ))
+            for form in NOUN_FORMS:
+                yield (noun, decl, form, tuple(
+                    decline_noun_specific(noun, decl, consGrad, *form)
+                ))
+
+def get_verb_results(verbs):
+    # generate the paradigm and each inflected form of each verb in each of
+    # its conjugations
+    for verb in verbs:
+        for conj in get_conjugations(verb):
+            consGrad = get_verb_cons_grad(verb, conj)
+            yield (verb, conj, conjugate_verb_paradigm_specific(
+                verb, conj, consGrad
+            ))
+            for form in VERB_FORMS:
+                yield (verb, conj, form, tuple(
+                    conjugate_verb_specific(verb, conj, consGrad, *form)
+                ))
+
+def test_results(words, get_results):
+    # compare results without the cache, with an empty cache and with all
+    # paradigms cached; return: (error count, number of results)
+
+    paradigmcache.disable()
+    expected = list(get_results(words))
+    paradigmcache.enable(maxEntries=None)
+    errorCnt = 0
+    for description in ("empty cache", "full cache"):
+        for (result, expectedResult) in zip(get_results(words), expected):
+            if result != expectedResult:
+                print_error(
+                    f"{description}: expected {expectedResult}, got {result}"
+                )
+                errorCnt += 1
+    # each paradigm was computed once
+    paradigmCnt = sum(1 for r in expected if len(r) == 3)
+    errorCnt += check_stats(
+        "no limit",
+        {"misses": paradigmCnt, "evictions": 0, "entries": paradigmCnt}
+    )
+    paradigmcache.disable()
+    return (errorCnt, len(expected))
+
+def main():
+    print("Testing paradigmcache.py...")
+    errorCnt = test_eviction()
+
+    (nounErrorCnt, nounResultCnt) = test_results(
+        read_test_words(NOUN_TEST_DIR), get_noun_results
+    )
+    (verbErrorCnt, verbResultCnt) = test_results(
+        read_test_words(VERB_TEST_DIR), get_verb_results
+    )
+    errorCnt += nounErrorCnt + verbErrorCnt
+
+    print(
+        f"Compared {nounResultCnt} noun result(s) and {verbResultCnt} verb "
+        "result(s) with and without the cache."
+    )
+    print(f"Detected {errorCnt} error(s).")
+
+main()
@@ -0,0 +1,75 @@
+"""Test ruleautomaton.py: check that the automata of noundecl.py and
+verbconj.py find the same rule as trying the rules one by one, for the words
+in the test files of test-decline_noun.py and test-conjugate_verb.py and in
+generated-lists/words.csv (if it exists)."""
+
+import glob, os, sys
+import noundecl, verbconj
+from ruleautomaton import RuleAutomaton
+
+TEST_DIRS = ("decline_noun-tests", "conjugate_verb-tests")
+WORDS_FILE = "generated-lists/words.csv"
+
+# (name, rules) of the rule lists to test
+RULE_LISTS = tuple(
+    (f"{module.__name__}.{name}", getattr(module, name))
+    for (module, names) in (
+        (noundecl, ("_RULES_1SYLL", "_RULES_2SYLL", "_RULES_3SYLL",
+        "_RULES_4SYLL")),
+        (verbconj, ("_RULES_2SYLL", "_RULES_3SYLL")),
+    )
+    for name in names
+)
+
+def read_words(filename):
+    # get the words (first fields) of a CSV file, skipping comments
+    with open(filename, "rt", encoding="utf8") as handle:
+        handle.seek(0)
+        for line in handle:
+            line = line.rstrip("\n")
+            if line and not line.startswith("#"):
+                yield line.split(",")[0]
+
+def get_words():
+    words = set()
+    for directory in TEST_DIRS:
+        for path in glob.glob(os.path.join(directory, "*.csv")):
+            words.update(read_words(path))
+    if os.path.isfile(WORDS_FILE):
+        words.update(read_words(WORDS_FILE))
+    else:
+        print(f"Warning: {WORDS_FILE} not found, skipping", file=sys.stderr)
+    # also as they are passed to the automata
+    words.update(w.strip("'- ") for w in list(words))
+    return sorted(words)
+
+def match_rules(rules, word):
+    # the rule-by-rule equivalent of RuleAutomaton.match()
+    for (value, regex) in rules:
+        if regex.search(word) is not None:
+            return value
+    return None
+
+def main():
+    print("Testing ruleautomaton.py...")
+    words = get_words()
+    errorCnt = 0
+
+    # every word against every rule list, regardless of its syllable count
+    for (name, rules) in RULE_LISTS:
+        automaton = RuleAutomaton(rules)
+        for word in words:
+            expected = match_rules(rules, word)
+            result = automaton.match(word)
+            if result != expected:
+                print(
+                    f"Error: {name}: '{word}': expected {expected}, got "
+                    f"{result}",
+                    file=sys.stderr
+                )
+                errorCnt += 1
+
+    print(f"Tested {len(RULE_LISTS)} rule list(s) and {len(words)} word(s).")
+    print(f"Detected {errorCnt} error(s).")
+
+main()
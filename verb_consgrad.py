@@ -1,6 +1,7 @@
 """Determine whether consonant gradation applies to a Finnish verb."""
 
 import re, sys
+import classcache
 from verbconj import get_conjugations, CONJUGATION_DESCRIPTIONS
 
 # Exceptions to rules. Notes:
@@ -78,7 +79,18 @@ def get_consonant_gradation(verb, conj, useExceptions=True):
     verb:          str
     conj:          Kotus conjugation (52-76)
     useExceptions: bool; should be True except for testing purposes
-    return:        does consonant gradation apply? (bool)"""
+    return:        does consonant gradation apply? (bool); from classcache if
+                   enabled"""
+
+    if not useExceptions:
+        return _get_consonant_gradation(verb, conj, False)
+    return classcache.get(
+        "verbConsGrad", (conj, verb), _get_consonant_gradation, verb, conj,
+        True
+    )
+
+def _get_consonant_gradation(verb, conj, useExceptions):
+    # see get_consonant_gradation()
 
     if useExceptions:
         if (conj, verb) in _EXCEPTIONS_NO:
@@ -86,10 +98,10 @@ def get_consonant_gradation(verb, conj, useExceptions=True):
         if (conj, verb) in _EXCEPTIONS_YES:
             return True
 
-    if conj not in _RULES:
-        return False
-
-    return re.search(_RULES[conj], verb) is not None
+    # call the compiled regex directly; re.search() would look it up in the
+    # cache of the re module first
+    regex = _RULES.get(conj)
+    return regex is not None and regex.search(verb) is not None
 
 def _get_redundant_exceptions():
     # generate verbs that are unnecessarily listed as exceptions
@@ -3,7 +3,9 @@
 # Note: A = a/ä, O = o/ö, U = u/y, V = any vowel, C = any consonant.
 
 import re, sys
+import classcache
 from countsyll import count_syllables
+from ruleautomaton import RuleAutomaton
 
 # A typical verb in each conjugation.
 # Forms: infinitive, 1SG present, 3SG past, 3SG conditional, 3SG imperative,
@@ -168,20 +170,37 @@ _EXCEPTIONS_3SYLL = {
     "nimetä": 75, "nujuta": 75, "peitota": 75, "piiluta": 75, "solmita": 75,
 }
 
-def get_conjugations(verb, useExceptions=True):
+# the rules compiled into automata that find the first matching rule in one
+# pass over the verb (see ruleautomaton.py; each is built on first use)
+_AUTOMATON_2SYLL = RuleAutomaton(_RULES_2SYLL)
+_AUTOMATON_3SYLL = RuleAutomaton(_RULES_3SYLL)
+
+def get_conjugations(verb, useExceptions=True, syllCnt=None):
     """Get the Kotus conjugation(s) of a Finnish verb.
     verb:          the verb in the 1st infinitive
     useExceptions: use True except for testing purposes
-    return:        a tuple of 0-2 conjugations (each 52-76)"""
+    syllCnt:       count_syllables() of the verb without leading/trailing
+                   "'- " if already known, otherwise None
+    return:        a tuple of 0-2 conjugations (each 52-76); from classcache
+                   if enabled"""
 
     verb = verb.strip("'- ")
+    if not useExceptions:
+        return _get_conjugations(verb, False, syllCnt)
+    return classcache.get(
+        "conjugations", verb, _get_conjugations, verb, True, syllCnt
+    )
+
+def _get_conjugations(verb, useExceptions, syllCnt):
+    # see get_conjugations(); verb has been stripped
 
     try:
         return _MULTI_CONJUGATION_VERBS[verb]
     except KeyError:
         pass
 
-    syllCnt = count_syllables(verb)
+    if syllCnt is None:
+        syllCnt = count_syllables(verb)
 
     if useExceptions:
         if syllCnt == 1:
@@ -196,14 +215,12 @@ def get_conjugations(verb, useExceptions=True):
             pass
 
     if syllCnt == 2:
-        rules = _RULES_2SYLL
+        automaton = _AUTOMATON_2SYLL
     else:
-        rules = _RULES_3SYLL
+        automaton = _AUTOMATON_3SYLL
 
-    for (conjugation, regex) in rules:
-        if regex.search(verb) is not None:
-            return (conjugation,)
-    return ()
+    conjugation = automaton.match(verb)
+    return () if conjugation is None else (conjugation,)
 
 def _get_redundant_exceptions():
     # generate verbs that are unnecessarily on the exceptions list
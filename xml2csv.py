@@ -1,118 +1,104 @@
-import re, sys
+import sys
+from xml.etree import ElementTree
 
-# a simple line in the XML file:
+# a simple entry in the XML file:
 #   <st>
 #     <s>yö</s>
 #     <t><tn>19</tn></t>
 #   </st>
 #
-# a more complex line in the XML file:
+# a more complex entry in the XML file:
 #   <st>
 #     <s>havas</s>
 #     <t> <tn>41</tn> <av>E</av> </t>
 #     <t> <tn>39</tn>            </t>
 #   </st>
 
-# 2 declensions/conjugations, consonant gradation in both
-REGEX_YY = re.compile("""
-    <s>([^<]+)</s>
-    .* >([0-9]+)</tn> .* </av>
-    .* >([0-9]+)</tn> .* </av>
-""", re.VERBOSE)
-# 2 declensions/conjugations, consonant gradation in at least 1st one
-REGEX_YN = re.compile("""
-    <s>([^<]+)</s>
-    .* >([0-9]+)</tn> .* </av>
-    .* >([0-9]+)</tn>
-""", re.VERBOSE)
-# 2 declensions/conjugations, consonant gradation in at least 2nd one
-REGEX_NY = re.compile("""
-    <s>([^<]+)</s>
-    .* >([0-9]+)</tn>
-    .* >([0-9]+)</tn> .* </av>
-""", re.VERBOSE)
-# 2 declensions/conjugations, don't care about consonant gradation
-REGEX_NN = re.compile("""
-    <s>([^<]+)</s>
-    .* >([0-9]+)</tn>
-    .* >([0-9]+)</tn>
-""", re.VERBOSE)
-# (at least) 1 declension/conjugation, consonant gradation
-REGEX_Y = re.compile("""
-    <s>([^<]+)</s>
-    .* >([0-9]+)</tn> .* </av>
-""", re.VERBOSE)
-# (at least) 1 declension/conjugation, don't care about consonant gradation
-REGEX_N = re.compile("""
-    <s>([^<]+)</s>
-    .* >([0-9]+)</tn>
-""", re.VERBOSE)
-# any number of declensions/conjugations, don't care about consonant gradation
-REGEX_NONE = re.compile("""
-    <s>([^<]+)</s>
-""", re.VERBOSE)
+def get_entries(filename):
+    # parse the XML file incrementally (one pass, no regexes); generate
+    # (word, declensions) for each <st> element; declensions: a tuple of
+    # (declension_or_conjugation, consonant_gradation) for each <t> element,
+    # e.g. ((41, True), (39, False))
 
-def read_lines(filename):
-    # generate lines without newlines
+    root = None
+    word = None
+    decls = []
+    for (event, elem) in ElementTree.iterparse(filename, ("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        # elements are handled as they end, so <tn> before its <av>
+        tag = elem.tag
+        if tag == "tn":
+            decls.append((int(elem.text, 10), False))
+        elif tag == "av":
+            decls[-1] = (decls[-1][0], True)
+        elif tag == "s":
+            word = elem.text
+        elif tag == "st":
+            assert len(decls) <= 2
+            if word:
+                yield (word, tuple(decls))
+            word = None
+            decls = []
+            # free the handled entries; the root would otherwise keep them
+            # (the <st> elements are children of the root)
+            root.clear()
 
-    with open(filename, "rt", encoding="utf8") as handle:
-        handle.seek(0)
-        for line in handle:
-            line = line.rstrip("\n")
-            assert line.count("</tn>") <= 2
-            yield line
+def get_word_tables(filename):
+    """Read the Kotus XML file once.
+    filename: the XML file
+    return:   (all_words, consonant_gradation_words); both are {word: set of
+              declensions/conjugations, ...}; the latter only has the words
+              and declensions/conjugations that consonant gradation applies
+              to"""
 
-def get_matches(filename, getAllWords):
-    # generate (match, regex) for lines
+    allWords = {}
+    consGradWords = {}
 
-    for line in read_lines(filename):
-        # detect number of conjugations and consonant gradation
-        for regex in (
-            REGEX_YY, REGEX_YN, REGEX_NY, REGEX_NN,
-            REGEX_Y, REGEX_N,
-            REGEX_NONE
-        ):
-            match = regex.search(line)
-            if match is not None:
-                break
+    for (word, decls) in get_entries(filename):
+        word = word.strip("'- ")
+        allWords.setdefault(word, set()).update(d for (d, cg) in decls)
+        # save only the declensions/conjugations with consonant gradation
+        consGradDecls = [d for (d, cg) in decls if cg]
+        if consGradDecls:
+            consGradWords.setdefault(word, set()).update(consGradDecls)
 
-        if match is not None \
-        and (getAllWords or regex in (REGEX_YY, REGEX_YN, REGEX_NY, REGEX_Y)):
-            yield (match, regex)
+    # add some useful words (names of letters)
+    for word in ("koo", "see", "vee", "öö"):
+        allWords.setdefault(word, set()).add(18)
+
+    return (allWords, consGradWords)
+
+def write_csv(words, handle):
+    # write {word: set of declensions/conjugations, ...} in CSV format
+    for word in sorted(words):
+        print(
+            ",".join([word] + [str(c) for c in sorted(words[word])]),
+            file=handle
+        )
 
 def main():
-    if len(sys.argv) != 3:
+    if len(sys.argv) == 3 and sys.argv[2] in ("a", "g"):
+        (allWords, consGradWords) = get_word_tables(sys.argv[1])
+        write_csv(
+            allWords if sys.argv[2] == "a" else consGradWords, sys.stdout
+        )
+    elif len(sys.argv) == 4:
+        # both tables from one pass
+        tables = get_word_tables(sys.argv[1])
+        for (filename, words) in zip(sys.argv[2:], tables):
+            with open(filename, "wt", encoding="utf8") as handle:
+                write_csv(words, handle)
+    else:
         sys.exit(
             "Read Kotus XML file, print distinct words and their declensions/"
             "conjugations (0-2) in CSV format. Arguments: XML file, which "
             "words ('a' = all, 'g' = only those that consonant gradation "
-            "applies to)."
+            "applies to). Or: XML file, CSV file to write all words to, CSV "
+            "file to write the words that consonant gradation applies to to."
         )
-    filename = sys.argv[1]
-    getAllWords = {"a": True, "g": False}[sys.argv[2]]
-
-    conjugationsByWord = {}  # {word: set of declensions/conjugations, ...}
-
-    for (match, regex) in get_matches(filename, getAllWords):
-        word = match.groups()[0].strip("'- ")
-        # save all conjugations or only those with consonant gradation
-        if not getAllWords and regex == REGEX_YN:
-            conjs = match.groups()[1:2]  # 1st only
-        elif not getAllWords and regex == REGEX_NY:
-            conjs = match.groups()[2:3]  # 2nd only
-        else:
-            conjs = match.groups()[1:]
-        conjs = {int(c, 10) for c in conjs}
-        conjugationsByWord.setdefault(word, set()).update(conjs)
-
-    # add some useful words (names of letters)
-    if getAllWords:
-        for word in ("koo", "see", "vee", "öö"):
-            conjugationsByWord.setdefault(word, set()).add(18)
-
-    for word in sorted(conjugationsByWord):
-        print(",".join(
-            [word] + [str(c) for c in sorted(conjugationsByWord[word])]
-        ))
 
-main()
+if __name__ == "__main__":
+    main()